@@ -0,0 +1,66 @@
+"""
+Compare the synchronous DRF read paths served over WSGI with their async
+variants served over ASGI.
+
+Start both servers with the same number of workers against the same database,
+for example:
+
+    gunicorn tickets.wsgi -w 4 -b 127.0.0.1:8001
+    uvicorn tickets.asgi:application --workers 4 --port 8002
+
+then run:
+
+    python -m benchmarks.async_vs_sync --screening 1 --movie 1
+"""
+
+import argparse
+import json
+
+from benchmarks.loadgen import run_load
+
+
+def scenarios(screening, movie):
+    return {
+        "schedule": ("/schedule/", "/async/schedule/"),
+        "seat_map": (
+            f"/screenings/{screening}/seats/",
+            f"/async/screenings/{screening}/seats/",
+        ),
+        "movie_detail": (
+            f"/movies/{movie}/?expand=genres,actors",
+            f"/async/movies/{movie}/?expand=genres,actors",
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--wsgi", default="http://127.0.0.1:8001")
+    parser.add_argument("--asgi", default="http://127.0.0.1:8002")
+    parser.add_argument("--screening", type=int, required=True)
+    parser.add_argument("--movie", type=int, required=True)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (sync_path, async_path) in scenarios(args.screening, args.movie).items():
+        results[name] = {
+            "wsgi": run_load(args.wsgi, [sync_path], args.requests, args.concurrency),
+            "asgi": run_load(args.asgi, [async_path], args.requests, args.concurrency),
+        }
+        for server, stats in results[name].items():
+            print(
+                f"{name:<14}{server:<6}{stats['rps']:>10} req/s"
+                f"{stats['p50_ms']:>10} ms p50{stats['p99_ms']:>10} ms p99"
+                f"{stats['errors']:>6} errors"
+            )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
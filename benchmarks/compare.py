@@ -0,0 +1,69 @@
+"""
+Compare two benchmark result files written by benchmarks.suite.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 10
+
+Exits with status 1 when an endpoint's p95 latency grew by more than the
+threshold percentage or when it issues more queries per request.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def change(old, new):
+    if not old:
+        return 0.0
+    return (new - old) / old * 100
+
+
+def compare(baseline, current, threshold):
+    rows, regressions = [], []
+    for name in sorted(set(baseline) | set(current)):
+        if name not in baseline or name not in current:
+            rows.append(
+                (name, "only in " + ("current" if name in current else "baseline"))
+            )
+            continue
+        old, new = baseline[name], current[name]
+        p95 = change(old["p95_ms"], new["p95_ms"])
+        queries = new["queries_per_request"] - old["queries_per_request"]
+        rows.append(
+            (
+                name,
+                f"p95 {old['p95_ms']:>8} -> {new['p95_ms']:>8} ms ({p95:+.1f}%)  "
+                f"rps {old['rps']:>8} -> {new['rps']:>8}  "
+                f"queries {old['queries_per_request']} -> {new['queries_per_request']}",
+            )
+        )
+        if p95 > threshold or queries > 0:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold", type=float, default=10, help="Allowed p95 growth in percent"
+    )
+    args = parser.parse_args()
+
+    rows, regressions = compare(load(args.baseline), load(args.current), args.threshold)
+    for name, line in rows:
+        marker = "!" if name in regressions else " "
+        print(f"{marker} {name:<26}{line}")
+    if regressions:
+        print(f"Regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
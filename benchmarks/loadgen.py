@@ -0,0 +1,82 @@
+import http.client
+import threading
+import time
+from collections import Counter
+from itertools import cycle
+from urllib.parse import urlsplit
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(latencies, errors, elapsed):
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+    }
+
+
+def run_load(
+    base_url, paths, requests=1000, concurrency=32, method="GET", body=None, bodies=None
+):
+    """Issue ``requests`` calls spread over ``concurrency`` keep-alive clients.
+
+    Requests cycle through ``paths`` and, when given, through ``bodies``; the
+    result counts the responses by status code.
+    """
+    target = urlsplit(base_url)
+    remaining = iter(range(requests))
+    payloads = cycle(bodies or [body])
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+    statuses = Counter()
+
+    def worker():
+        connection = http.client.HTTPConnection(target.hostname, target.port)
+        headers = {"Content-Type": "application/json"} if body or bodies else {}
+        for path in cycle(paths):
+            with lock:
+                if next(remaining, None) is None:
+                    break
+                payload = next(payloads)
+            started = time.perf_counter()
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                ok = response.status < 500
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                ok = False
+                status = None
+            elapsed = time.perf_counter() - started
+            with lock:
+                if status is not None:
+                    statuses[status] += 1
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = summarize(latencies, errors[0], time.perf_counter() - started)
+    stats["statuses"] = {str(code): count for code, count in sorted(statuses.items())}
+    return stats
@@ -0,0 +1,68 @@
+"""
+Measure concurrent ticket purchases against a running deployment: buyers race
+for the free seats of a screening, each seat wanted by --contention buyers, and
+the run reports tickets sold per second next to the conflicts turned away.
+
+Point it at a screening with free seats; every run sells them, so use a
+throwaway database:
+
+    python -m benchmarks.purchases http://127.0.0.1:8080 --screening 1
+"""
+
+import argparse
+import json
+import urllib.request
+
+from benchmarks.loadgen import run_load
+
+
+def free_seats(base_url, screening):
+    with urllib.request.urlopen(f"{base_url}/screenings/{screening}/seats/") as page:
+        seat_map = json.load(page)
+    states = [state for state in seat_map["seats"] if state != "-"]
+    return [seat for seat, state in zip(seat_map["ids"], states) if state == "0"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("url")
+    parser.add_argument("--screening", type=int, required=True)
+    parser.add_argument("--contention", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/")
+    seats = free_seats(url, args.screening)
+    if not seats:
+        parser.error(f"Screening {args.screening} has no free seats")
+    # Each seat's buyers take consecutive requests, so they reach the server
+    # together and race for it.
+    bodies = [
+        json.dumps({"movie_screening": args.screening, "seat": seat})
+        for seat in seats
+        for _ in range(args.contention)
+    ]
+    stats = run_load(
+        url,
+        ["/tickets/"],
+        len(bodies),
+        args.concurrency,
+        method="POST",
+        bodies=bodies,
+    )
+    sold = stats["statuses"].get("201", 0)
+    stats["purchases_per_second"] = round(sold / stats["seconds"], 1)
+    print(
+        f"{sold} of {len(seats)} seats sold{stats['purchases_per_second']:>10} "
+        f"purchases/s{stats['p50_ms']:>10} ms p50{stats['p99_ms']:>10} ms p99  "
+        f"{stats['statuses']}"
+    )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(stats, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
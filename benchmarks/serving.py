@@ -0,0 +1,54 @@
+"""
+Measure read throughput of a running deployment, to compare serving modes
+such as the development server against gunicorn with persistent or pooled
+database connections.
+
+    python -m benchmarks.serving runserver=http://127.0.0.1:8021 \\
+        gunicorn=http://127.0.0.1:8080 --screening 1 --movie 1
+"""
+
+import argparse
+import json
+
+from benchmarks.loadgen import run_load
+
+
+def paths(screening, movie):
+    return [
+        "/genres/",
+        "/movies/",
+        f"/movies/{movie}/",
+        "/schedule/",
+        f"/screenings/{screening}/seats/",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("targets", nargs="+", metavar="LABEL=URL")
+    parser.add_argument("--screening", type=int, required=True)
+    parser.add_argument("--movie", type=int, required=True)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    for target in args.targets:
+        label, url = target.split("=", 1)
+        results[label] = run_load(
+            url, paths(args.screening, args.movie), args.requests, args.concurrency
+        )
+        stats = results[label]
+        print(
+            f"{label:<16}{stats['rps']:>10} req/s{stats['p50_ms']:>10} ms p50"
+            f"{stats['p99_ms']:>10} ms p99{stats['errors']:>6} errors"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
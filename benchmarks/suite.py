@@ -0,0 +1,374 @@
+"""
+Benchmark every API endpoint in-process and store the results as JSON.
+
+The suite runs against its own test database (created next to the configured
+one and kept between runs), seeds it once per scale and then drives each
+named route in tickets/urls.py through Django's test client, recording
+latency percentiles, throughput and SQL queries per request. A route without
+a scenario or an entry in SKIPPED fails the run.
+
+    python -m benchmarks.suite --scale small --output bench.json
+    python -m benchmarks.compare old.json bench.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def setup(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup()
+
+
+def prepare_database(scale, reseed):
+    from django.core.management import call_command
+    from django.db import connection
+
+    from core.seeding import SCALES, is_seeded, seed
+
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=True, serialize=False
+    )
+    if reseed and is_seeded():
+        call_command("flush", interactive=False, verbosity=0)
+    if not is_seeded():
+        started = time.perf_counter()
+        seed(SCALES[scale])
+        print(f"Seeded {scale} dataset in {time.perf_counter() - started:.1f}s")
+
+
+def route_names(patterns=None):
+    from django.urls import URLPattern, URLResolver, get_resolver
+
+    names = []
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace:  # admin
+                continue
+            names += route_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.append(pattern.name)
+    return names
+
+
+class Sample:
+    def __init__(self, rng):
+        from core.holds import get_hold_backend
+        from core.models import (
+            Actor,
+            CinemaHall,
+            Genre,
+            Movie,
+            MovieScreening,
+            Seat,
+            Ticket,
+        )
+
+        self.rng = rng
+        self.genres = list(Genre.objects.values_list("pk", flat=True)[:200])
+        self.actors = list(Actor.objects.values_list("pk", flat=True)[:200])
+        self.movies = list(Movie.objects.values_list("pk", flat=True)[:200])
+        self.halls = list(CinemaHall.objects.values_list("pk", flat=True)[:200])
+        self.seats = list(Seat.objects.values_list("pk", flat=True)[:200])
+        self.screenings = list(
+            MovieScreening.objects.order_by("?").values_list("pk", "hall_id")[:200]
+        )
+        self.tickets = list(Ticket.objects.values_list("pk", flat=True)[:200])
+        self.first_date = MovieScreening.objects.order_by("date").first().date
+        self.seat_model = Seat
+        self.holds = get_hold_backend()
+
+    def pick(self, values):
+        return self.rng.choice(values)
+
+    def free_seats(self, groups, size):
+        found = []
+        for screening_id, hall_id in self.screenings:
+            free = set(
+                self.seat_model.objects.filter(hall_id=hall_id)
+                .exclude(ticket__movie_screening_id=screening_id)
+                .values_list("pk", flat=True)
+            )
+            free = sorted(free - set(self.holds.held_seats(screening_id, free)))
+            self.rng.shuffle(free)
+            while len(free) >= size and len(found) < groups:
+                found.append((screening_id, [free.pop() for _ in range(size)]))
+            if len(found) == groups:
+                break
+        return found
+
+
+def scenarios(sample, iterations):
+    from django.urls import reverse
+
+    from core.booking import hold_seats
+    from core.exports import EXPORTS
+    from core.models import CinemaHall, MovieScreening
+
+    def get(name, query=""):
+        def build():
+            return [("get", reverse(name) + query, None)] * iterations
+
+        return build
+
+    def get_each(name, values, query=""):
+        def build():
+            return [
+                ("get", reverse(name, kwargs={"pk": sample.pick(values)}) + query, None)
+                for _ in range(iterations)
+            ]
+
+        return build
+
+    def screening_get(name, query=""):
+        values = [pk for pk, _ in sample.screenings]
+        return get_each(name, values, query)
+
+    schedule_query = f"?from={sample.first_date.isoformat().replace('+', '%2B')}"
+    report_to = (sample.first_date + timedelta(days=90)).isoformat().replace("+", "%2B")
+    report_query = f"{schedule_query}&to={report_to}"
+
+    def export(fmt):
+        def build():
+            # Alternates between the exports; the body is read in measure().
+            return [
+                (
+                    "get",
+                    reverse("export", kwargs={"name": name, "fmt": fmt}) + report_query,
+                    None,
+                )
+                for name, _ in zip(itertools.cycle(sorted(EXPORTS)), range(iterations))
+            ]
+
+        return build
+
+    def ticket_create():
+        return [
+            (
+                "post",
+                reverse("ticket-list"),
+                {"movie_screening": screening, "seat": seats[0]},
+            )
+            for screening, seats in sample.free_seats(iterations, 1)
+        ]
+
+    def ticket_batch():
+        return [
+            (
+                "post",
+                reverse("ticket-batch"),
+                {
+                    "movie_screening": screening,
+                    "tickets": [{"seat": seat} for seat in seats],
+                },
+            )
+            for screening, seats in sample.free_seats(iterations, 4)
+        ]
+
+    def hold_create():
+        return [
+            (
+                "post",
+                reverse("screening-hold", kwargs={"pk": screening}),
+                {"seats": seats},
+            )
+            for screening, seats in sample.free_seats(iterations, 2)
+        ]
+
+    def hold_release():
+        requests = []
+        for screening_id, seats in sample.free_seats(iterations, 2):
+            screening = MovieScreening.objects.get(pk=screening_id)
+            token = hold_seats(screening, seats).token
+            url = reverse(
+                "screening-hold-release", kwargs={"pk": screening_id, "token": token}
+            )
+            requests.append(("delete", url, None))
+        return requests
+
+    def hall_layout():
+        halls = CinemaHall.objects.bulk_create(
+            CinemaHall(name=f"Bench {index}") for index in range(iterations)
+        )
+        layout = {"rows": [{"row": row, "seats": 25} for row in range(1, 21)]}
+        return [
+            ("post", reverse("cinema-hall-layout", kwargs={"pk": hall.pk}), layout)
+            for hall in halls
+        ]
+
+    def schedule_import():
+        # A week of screenings four hours apart in an empty hall.
+        halls = CinemaHall.objects.bulk_create(
+            CinemaHall(name=f"Import {index}") for index in range(iterations)
+        )
+        return [
+            (
+                "post",
+                reverse("screening-import"),
+                {
+                    "screenings": [
+                        {
+                            "movie": sample.pick(sample.movies),
+                            "hall": hall.pk,
+                            "date": (
+                                sample.first_date + timedelta(days=day, hours=hour)
+                            ).isoformat(),
+                        }
+                        for day in range(7)
+                        for hour in range(0, 24, 4)
+                    ]
+                },
+            )
+            for hall in halls
+        ]
+
+    return {
+        "api-root": get("api-root"),
+        "genre-list": get("genre-list"),
+        "genre-detail": get_each("genre-detail", sample.genres),
+        "actor-list": get("actor-list"),
+        "actor-detail": get_each("actor-detail", sample.actors),
+        "movie-list": get("movie-list", "?expand=genres,actors"),
+        "movie-detail": get_each(
+            "movie-detail", sample.movies, "?expand=genres,actors"
+        ),
+        "async-movie-detail": get_each(
+            "async-movie-detail", sample.movies, "?expand=genres,actors"
+        ),
+        "cinema-hall-list": get("cinema-hall-list"),
+        "cinema-hall-detail": get_each("cinema-hall-detail", sample.halls),
+        "cinema-hall-layout": hall_layout,
+        "seat-list": get("seat-list"),
+        "seat-detail": get_each("seat-detail", sample.seats),
+        "screening-list": get("screening-list"),
+        "screening-detail": screening_get("screening-detail"),
+        "screening-seat-map": screening_get("screening-seat-map"),
+        "async-screening-seat-map": screening_get("async-screening-seat-map"),
+        "screening-hold": hold_create,
+        "screening-hold-release": hold_release,
+        "screening-import": schedule_import,
+        "schedule": get("schedule", schedule_query),
+        "async-schedule": get("async-schedule", schedule_query),
+        "report-revenue": get("report-revenue", report_query + "&group=movie,day"),
+        "report-occupancy": get("report-occupancy", report_query),
+        "export-csv": export("csv"),
+        "export-ndjson": export("ndjson"),
+        "cache-stats": get("cache-stats"),
+        "request-stats": get("request-stats"),
+        "metrics": get("metrics"),
+        "ticket-list": ticket_create,
+        "ticket-detail": get_each("ticket-detail", sample.tickets),
+        "ticket-batch": ticket_batch,
+    }
+
+
+# Scenarios named after something other than the route they drive.
+SCENARIO_ROUTES = {
+    "export-csv": "export",
+    "export-ndjson": "export",
+}
+
+SKIPPED = {
+    "screening-events": "infinite event stream",
+    "schema": "documentation",
+    "swagger-ui": "documentation",
+}
+
+
+def measure(client, requests):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from benchmarks.loadgen import summarize
+
+    latencies, queries, statuses = [], [], {}
+    started = time.perf_counter()
+    for method, path, payload in requests:
+        with CaptureQueriesContext(connection) as captured:
+            began = time.perf_counter()
+            response = getattr(client, method)(
+                path, payload, content_type="application/json"
+            )
+            if response.streaming:
+                b"".join(response.streaming_content)
+            latencies.append(time.perf_counter() - began)
+        queries.append(len(captured))
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    stats = summarize(latencies, 0, time.perf_counter() - started)
+    stats["queries_per_request"] = round(sum(queries) / len(queries), 2)
+    stats["max_queries"] = max(queries)
+    stats["statuses"] = {str(code): count for code, count in sorted(statuses.items())}
+    return stats
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--settings", default="tickets.settings.local")
+    parser.add_argument("--scale", choices=["small", "full"], default="small")
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--only", nargs="*", help="Only run these scenarios")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    setup(args.settings)
+    from django.test import Client
+
+    prepare_database(args.scale, args.reseed)
+    sample = Sample(random.Random(0))
+    available = scenarios(sample, args.iterations)
+    covered = {SCENARIO_ROUTES.get(name, name) for name in available} | set(SKIPPED)
+    uncovered = sorted(set(route_names()) - covered)
+    if uncovered:
+        sys.exit(f"Routes without a scenario: {', '.join(uncovered)}")
+    client = Client()
+
+    results = {}
+    for name, build in available.items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = stats = measure(client, build())
+        print(
+            f"{name:<26}{stats['rps']:>9} req/s{stats['p50_ms']:>9} ms p50"
+            f"{stats['p95_ms']:>9} ms p95{stats['p99_ms']:>9} ms p99"
+            f"{stats['queries_per_request']:>7} queries  {stats['statuses']}"
+        )
+
+    if args.output:
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "scale": args.scale,
+                "iterations": args.iterations,
+                "created": datetime.now(timezone.utc).isoformat(),
+            },
+            "results": results,
+            "skipped": SKIPPED,
+        }
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
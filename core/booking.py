@@ -0,0 +1,182 @@
+from collections import Counter
+
+from django.db import IntegrityError, connection, transaction
+from rest_framework.exceptions import NotFound, ValidationError
+
+from core.counters import add_sold
+from core.events import FREE, HELD, SOLD, publish_seats
+from core.exceptions import SeatHeld, SeatTaken
+from core.holds import get_hold_backend, get_hold_ttl
+from core.metrics import BOOKING_CONFLICTS, TICKETS_SOLD
+from core.models import Seat, Ticket
+from core.pricing import quote, quote_seat
+
+LOCK_KEY_MASK = 0x7FFFFFFF
+
+SEAT_NOT_IN_HALL = "Seat does not belong to the screening's hall."
+SEAT_SOLD = "Seat is already sold."
+SEAT_LOCKED = "Seat is being bought by another customer."
+SEAT_HELD = "Seat is held by another customer."
+
+CONFLICT_REASONS = {SEAT_SOLD: "sold", SEAT_LOCKED: "locked", SEAT_HELD: "held"}
+
+
+def conflict(exception, reason, operation, amount=1):
+    BOOKING_CONFLICTS.inc(amount, reason=reason, operation=operation)
+    return exception
+
+
+def count_sold(amount):
+    transaction.on_commit(lambda: TICKETS_SOLD.inc(amount))
+
+
+def lock_seats(screening_id, seat_ids):
+    # Non-blocking per (screening, seat) advisory locks held until commit, so a
+    # racing buyer is turned away at once instead of queueing on the unique index.
+    # Returns the seats that could not be locked.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT seat_id FROM unnest(%s::bigint[]) AS seat_id "
+            "WHERE NOT pg_try_advisory_xact_lock(%s::int, (seat_id & %s)::int)",
+            [sorted(seat_ids), screening_id & LOCK_KEY_MASK, LOCK_KEY_MASK],
+        )
+        return {seat_id for (seat_id,) in cursor.fetchall()}
+
+
+def foreign_holds(screening_id, seat_ids, hold=None):
+    held = get_hold_backend().held_seats(screening_id, seat_ids)
+    return {seat_id for seat_id, token in held.items() if token != hold}
+
+
+def release_on_commit(screening_id, hold, seat_ids):
+    if hold is not None and seat_ids:
+        transaction.on_commit(
+            lambda: get_hold_backend().release(screening_id, hold, seat_ids)
+        )
+
+
+def hold_seats(movie_screening, seat_ids, ttl=None):
+    seat_ids = set(seat_ids)
+    if Seat.objects.filter(
+        hall_id=movie_screening.hall_id, pk__in=seat_ids
+    ).count() != len(seat_ids):
+        raise ValidationError({"seats": "Seats must belong to the screening's hall."})
+    if Ticket.objects.filter(
+        movie_screening=movie_screening, seat_id__in=seat_ids
+    ).exists():
+        raise conflict(SeatTaken(), "sold", "hold")
+    hold = get_hold_backend().hold(
+        movie_screening.pk, seat_ids, ttl if ttl is not None else get_hold_ttl()
+    )
+    if hold is None:
+        raise conflict(SeatHeld(), "held", "hold")
+    publish_seats(
+        movie_screening.pk, hold.seat_ids, HELD, expires_at=hold.expires_at.isoformat()
+    )
+    return hold
+
+
+def purchase_ticket(movie_screening, seat, hold=None):
+    with transaction.atomic():
+        if seat is not None:
+            if lock_seats(movie_screening.pk, [seat.pk]):
+                raise conflict(SeatTaken(), "locked", "purchase")
+            if foreign_holds(movie_screening.pk, [seat.pk], hold):
+                raise conflict(SeatHeld(), "held", "purchase")
+        price = quote_seat(movie_screening, seat)
+        try:
+            ticket = Ticket.objects.create(
+                movie_screening=movie_screening, seat=seat, price=price
+            )
+        except IntegrityError:
+            raise conflict(SeatTaken(), "sold", "purchase")
+        if seat is not None:
+            release_on_commit(movie_screening.pk, hold, [seat.pk])
+        count_sold(1)
+        return ticket
+
+
+def purchase_tickets(movie_screening, seat_ids, hold=None):
+    seat_ids = set(seat_ids)
+    rows = dict(
+        Seat.objects.filter(
+            hall_id=movie_screening.hall_id, pk__in=seat_ids
+        ).values_list("pk", "row")
+    )
+    in_hall = set(rows)
+    if in_hall != seat_ids:
+        raise ValidationError(
+            {"seats": {seat_id: SEAT_NOT_IN_HALL for seat_id in seat_ids - in_hall}}
+        )
+
+    with transaction.atomic():
+        errors = {
+            seat_id: SEAT_LOCKED for seat_id in lock_seats(movie_screening.pk, seat_ids)
+        }
+        sold = Ticket.objects.filter(
+            movie_screening=movie_screening, seat_id__in=seat_ids
+        ).values_list("seat_id", flat=True)
+        errors.update((seat_id, SEAT_SOLD) for seat_id in sold)
+        for seat_id in foreign_holds(movie_screening.pk, seat_ids - set(errors), hold):
+            errors[seat_id] = SEAT_HELD
+        if errors:
+            for message, amount in Counter(errors.values()).items():
+                conflict(None, CONFLICT_REASONS[message], "purchase", amount)
+            raise SeatTaken({"seats": errors})
+
+        prices = quote(movie_screening, rows)
+        try:
+            tickets = Ticket.objects.bulk_create(
+                Ticket(movie_screening=movie_screening, seat_id=seat_id, price=price)
+                for seat_id, price in sorted(prices.items())
+            )
+        except IntegrityError:
+            raise conflict(SeatTaken(), "sold", "purchase", len(seat_ids))
+        add_sold(movie_screening.pk, len(tickets))
+        release_on_commit(movie_screening.pk, hold, seat_ids)
+        publish_seats(movie_screening.pk, seat_ids, SOLD)
+        count_sold(len(tickets))
+        return tickets
+
+
+def move_ticket(ticket, movie_screening, seat, hold=None):
+    # Goes through the same locks and holds as a purchase, and the ticket is
+    # re-quoted for where it ends up.
+    previous_screening_id, previous_seat_id = ticket.movie_screening_id, ticket.seat_id
+    seat_id = seat.pk if seat is not None else None
+    if (movie_screening.pk, seat_id) == (previous_screening_id, previous_seat_id):
+        return ticket
+    with transaction.atomic():
+        if seat is not None:
+            if lock_seats(movie_screening.pk, [seat.pk]):
+                raise conflict(SeatTaken(), "locked", "move")
+            if foreign_holds(movie_screening.pk, [seat.pk], hold):
+                raise conflict(SeatHeld(), "held", "move")
+        ticket.movie_screening, ticket.seat = movie_screening, seat
+        ticket.price = quote_seat(movie_screening, seat)
+        try:
+            ticket.save()
+        except IntegrityError:
+            raise conflict(SeatTaken(), "sold", "move")
+        had_seat = int(previous_seat_id is not None)
+        has_seat = int(seat is not None)
+        if movie_screening.pk != previous_screening_id:
+            # Also marks the old screening for the next sales summary refresh
+            # when the ticket had no seat.
+            add_sold(previous_screening_id, -had_seat)
+            add_sold(movie_screening.pk, has_seat)
+        elif had_seat != has_seat:
+            add_sold(movie_screening.pk, has_seat - had_seat)
+        if seat is not None:
+            release_on_commit(movie_screening.pk, hold, [seat.pk])
+    publish_seats(previous_screening_id, [previous_seat_id], FREE)
+    publish_seats(movie_screening.pk, [seat_id], SOLD)
+    return ticket
+
+
+def release_hold(movie_screening, token):
+    released = get_hold_backend().release(movie_screening.pk, token)
+    if not released:
+        raise NotFound("No active hold with this token for the screening.")
+    publish_seats(movie_screening.pk, released, FREE)
+    return released
@@ -0,0 +1,134 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.conditional import respond_conditionally
+from core.metrics import RESPONSE_CACHE_REQUESTS
+from core.routing import on_primary
+
+VERSION_KEY = "response-cache:version:{}"
+HITS_KEY = "response-cache:hits:{}"
+MISSES_KEY = "response-cache:misses:{}"
+
+cached_views = set()
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE["CACHE"]]
+
+
+def model_versions(models):
+    # A model's version is bumped on every write, so entries built from older
+    # data are simply never read again and age out on their own.
+    cache = get_cache()
+    keys = [VERSION_KEY.format(model._meta.label_lower) for model in models]
+    versions = cache.get_many(keys)
+    for key in set(keys) - set(versions):
+        cache.add(key, time.time_ns(), timeout=None)
+        versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    cache = get_cache()
+    key = VERSION_KEY.format(model._meta.label_lower)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def count(key):
+    cache = get_cache()
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def cache_stats():
+    cache = get_cache()
+    counters = cache.get_many(
+        [HITS_KEY.format(name) for name in cached_views]
+        + [MISSES_KEY.format(name) for name in cached_views]
+    )
+    stats = {}
+    for name in sorted(cached_views):
+        hits = counters.get(HITS_KEY.format(name), 0)
+        misses = counters.get(MISSES_KEY.format(name), 0)
+        total = hits + misses
+        stats[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else None,
+        }
+    return stats
+
+
+def reset_cache_stats():
+    get_cache().delete_many(
+        [HITS_KEY.format(name) for name in cached_views]
+        + [MISSES_KEY.format(name) for name in cached_views]
+    )
+
+
+class CachedResponseMixin:
+    cache_models = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.cache_models:
+            cached_views.add(cls.__name__)
+
+    def get_cache_key(self, request):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        versions = model_versions(self.cache_models)
+        raw = f"{request.path}?{query}:{versions}"
+        digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+        return f"response-cache:{type(self).__name__}:{digest}"
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        name = type(self).__name__
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            count(HITS_KEY.format(name))
+            RESPONSE_CACHE_REQUESTS.inc(view=name, result="hit")
+            # Entries keep the validators they were served with, so a hit
+            # answers conditional requests without touching the database.
+            data, etag, timestamp = entry
+            response = respond_conditionally(
+                request, etag, timestamp, lambda: Response(data)
+            )
+            response["X-Cache"] = "HIT"
+            return response
+
+        count(MISSES_KEY.format(name))
+        RESPONSE_CACHE_REQUESTS.inc(view=name, result="miss")
+        # Misses read from the primary: a lagging replica could store data
+        # older than the version in the key.
+        with on_primary():
+            response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            entry = (
+                response.data,
+                response.get("ETag"),
+                parse_http_date_safe(response.get("Last-Modified")),
+            )
+            cache.set(key, entry, settings.RESPONSE_CACHE["TIMEOUT"])
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
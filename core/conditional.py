@@ -0,0 +1,73 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    raw = ":".join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+
+def respond_conditionally(request, etag, timestamp, respond):
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = respond()
+    if etag is not None:
+        response.headers.setdefault("ETag", etag)
+    if timestamp is not None:
+        response.headers.setdefault("Last-Modified", http_date(timestamp))
+    return response
+
+
+class ConditionalGetMixin:
+    # Validators come from one aggregate per queryset instead of serializing,
+    # so an unchanged resource costs a single indexed query to revalidate.
+    # Lists whose rows show fields of related rows add their updated_at here.
+    validator_fields = ("updated_at",)
+
+    def get_validator_querysets(self):
+        return [self.filter_queryset(self.get_queryset())]
+
+    def list_validators(self, request):
+        parts = [request.get_full_path()]
+        for queryset in self.get_validator_querysets():
+            state = queryset.order_by().aggregate(
+                *(Max(field) for field in self.validator_fields), Count("pk")
+            )
+            parts += state.values()
+        return make_etag(*parts), None
+
+    def detail_validators(self, request):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        querysets = self.get_validator_querysets()
+        last_modified = (
+            querysets[0]
+            .filter(**{self.lookup_field: lookup})
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if last_modified is None:
+            return None, None
+        parts = [request.get_full_path(), last_modified]
+        for queryset in querysets[1:]:
+            parts.append(queryset.order_by().aggregate(Max("updated_at")))
+        return make_etag(*parts), last_modified
+
+    def conditional_response(self, validators, handler, request, *args, **kwargs):
+        etag, last_modified = validators(request)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return respond_conditionally(
+            request, etag, timestamp, lambda: handler(request, *args, **kwargs)
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.list_validators, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.detail_validators, super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,56 @@
+from django.db.models import F, OuterRef, Q
+from django.utils import timezone
+
+from core.models import MovieScreening, Seat, Ticket
+from core.schedule import count_of
+
+# MovieScreening.seats_total and seats_sold are kept in step by the ticket,
+# seat and layout write paths, always through F() or subquery updates so
+# concurrent writers never overwrite each other. reconcile_counters repairs
+# whatever slips past them, such as raw SQL or COPY imports.
+
+
+def hall_seats():
+    return count_of(Seat.objects.filter(hall=OuterRef("hall")), "hall")
+
+
+def sold_seats():
+    return count_of(
+        Ticket.objects.filter(movie_screening=OuterRef("pk"), seat__isnull=False),
+        "movie_screening",
+    )
+
+
+# Every counter update also touches updated_at, which drives the screenings'
+# ETags and the incremental sales summary refresh.
+
+
+def add_sold(screening_id, amount):
+    MovieScreening.objects.filter(pk=screening_id).update(
+        seats_sold=F("seats_sold") + amount, updated_at=timezone.now()
+    )
+
+
+def recount(screenings):
+    return screenings.update(
+        seats_total=hall_seats(), seats_sold=sold_seats(), updated_at=timezone.now()
+    )
+
+
+def recount_halls(hall_ids):
+    return recount(MovieScreening.objects.filter(hall_id__in=hall_ids))
+
+
+def drifted():
+    return MovieScreening.objects.alias(
+        actual_total=hall_seats(), actual_sold=sold_seats()
+    ).filter(~Q(seats_total=F("actual_total")) | ~Q(seats_sold=F("actual_sold")))
+
+
+def reconcile_counters(dry_run=False):
+    # One scan finds the screenings whose counters drifted and one UPDATE
+    # recounts them. Returns their ids.
+    ids = list(drifted().values_list("pk", flat=True))
+    if ids and not dry_run:
+        recount(MovieScreening.objects.filter(pk__in=ids))
+    return ids
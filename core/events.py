@@ -0,0 +1,119 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from core.utils import load_backend
+
+SOLD = "sold"
+HELD = "held"
+FREE = "free"
+
+
+class InProcessBroker:
+    # Fans events out to subscribers living in this process only; events are
+    # handed to each subscriber's event loop, so publishing is thread-safe.
+
+    def __init__(self, queue_size=1000):
+        self.queue_size = queue_size
+        self.subscribers = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def publish(self, screening_id, event):
+        with self.lock:
+            subscribers = list(self.subscribers[screening_id])
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self.deliver, queue, event)
+
+    def deliver(self, queue, event):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    async def subscribe(self, screening_id):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self.lock:
+            self.subscribers[screening_id].add(subscriber)
+        try:
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            with self.lock:
+                self.subscribers[screening_id].discard(subscriber)
+                if not self.subscribers[screening_id]:
+                    del self.subscribers[screening_id]
+
+
+class RedisBroker:
+    # Redis pub/sub, one channel per screening, for deployments with several
+    # worker processes.
+
+    def __init__(self, url, prefix="seat-events"):
+        self.url = url
+        self.prefix = prefix
+        self._client = None
+
+    def channel(self, screening_id):
+        return f"{self.prefix}:{screening_id}"
+
+    def publish(self, screening_id, event):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(self.channel(screening_id), json.dumps(event))
+
+    async def subscribe(self, screening_id):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        async with client.pubsub() as pubsub:
+            await pubsub.subscribe(self.channel(screening_id))
+            try:
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        yield json.loads(message["data"])
+            finally:
+                await client.aclose()
+
+
+def get_broker():
+    return load_backend(settings.SEAT_EVENTS, key="BROKER")
+
+
+def publish_seats(screening_id, seat_ids, state, **extra):
+    seat_ids = sorted(seat_id for seat_id in seat_ids if seat_id is not None)
+    if not seat_ids:
+        return
+    event = {"seats": seat_ids, "state": state, **extra}
+    transaction.on_commit(lambda: get_broker().publish(screening_id, event))
+
+
+def format_event(event):
+    return f"data: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+async def seat_event_stream(screening_id):
+    config = settings.SEAT_EVENTS
+    events = get_broker().subscribe(screening_id)
+    # Waiting on the subscription in a task keeps it alive across keepalives.
+    pending = asyncio.ensure_future(anext(events))
+    try:
+        yield f"retry: {config['RETRY_MS']}\n\n"
+        while True:
+            done, _ = await asyncio.wait({pending}, timeout=config["KEEPALIVE"])
+            if not done:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(pending.result())
+            pending = asyncio.ensure_future(anext(events))
+    finally:
+        pending.cancel()
+        try:
+            await pending
+        except (asyncio.CancelledError, StopAsyncIteration):
+            pass
+        await events.aclose()
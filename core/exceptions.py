@@ -0,0 +1,20 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class SeatTaken(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This seat is already taken for the screening."
+    default_code = "seat_taken"
+
+
+class SeatHeld(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This seat is held by another customer."
+    default_code = "seat_held"
+
+
+class ScheduleConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The hall is already booked at this time."
+    default_code = "schedule_conflict"
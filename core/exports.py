@@ -0,0 +1,104 @@
+import csv
+import io
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from core.models import Ticket
+from core.reports import occupancy
+from core.utils import chunked
+
+CHUNK_SIZE = 2000
+
+TICKET_COLUMNS = {
+    "id": F("id"),
+    "screening": F("movie_screening"),
+    "date": F("movie_screening__date"),
+    "movie": F("movie_screening__movie"),
+    "movie_title": F("movie_screening__movie__title"),
+    "hall": F("movie_screening__hall"),
+    "hall_name": F("movie_screening__hall__name"),
+    "row": F("seat__row"),
+    "seat": F("seat__number"),
+    "price": F("price"),
+}
+
+SALES_COLUMNS = [
+    "id",
+    "date",
+    "movie",
+    "movie_title",
+    "hall",
+    "hall_name",
+    "seats_total",
+    "seats_sold",
+    "occupancy",
+    "revenue",
+]
+
+
+def ticket_rows(date_from, date_to, hall=None, genre=None):
+    tickets = Ticket.objects.filter(
+        movie_screening__date__gte=date_from, movie_screening__date__lt=date_to
+    )
+    if hall is not None:
+        tickets = tickets.filter(movie_screening__hall_id=hall)
+    if genre is not None:
+        tickets = tickets.filter(movie_screening__movie__genres=genre)
+    return list(TICKET_COLUMNS), tickets.order_by(
+        "movie_screening__date", "movie_screening", "id"
+    ).values_list(*TICKET_COLUMNS.values())
+
+
+def sales_rows(date_from, date_to, hall=None, genre=None):
+    screenings = occupancy(date_from, date_to, hall=hall, genre=genre)
+    return SALES_COLUMNS, screenings.order_by("date", "id").values_list(*SALES_COLUMNS)
+
+
+EXPORTS = {"tickets": ticket_rows, "sales": sales_rows}
+
+
+def iter_rows(queryset):
+    # A server-side cursor on Postgres, so memory use does not grow with the
+    # number of rows.
+    return chunked(queryset.iterator(chunk_size=CHUNK_SIZE), CHUNK_SIZE)
+
+
+def stream_csv(columns, queryset):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for chunk in iter_rows(queryset):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in row
+            ]
+            for row in chunk
+        )
+        yield buffer.getvalue()
+
+
+def stream_ndjson(columns, queryset):
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    for chunk in iter_rows(queryset):
+        yield "".join(encoder.encode(dict(zip(columns, row))) + "\n" for row in chunk)
+
+
+async def pull_async(chunks):
+    # Under ASGI a sync body would be read into a list before sending, so each
+    # chunk is pulled on the request's sync thread instead, which also keeps
+    # the server-side cursor on one connection.
+    chunks = iter(chunks)
+    while (chunk := await sync_to_async(next)(chunks, None)) is not None:
+        yield chunk
+
+
+FORMATS = {
+    "csv": (stream_csv, "text/csv; charset=utf-8"),
+    "ndjson": (stream_ndjson, "application/x-ndjson"),
+}
@@ -0,0 +1,107 @@
+from datetime import timezone
+
+import factory
+from factory import Faker, SubFactory
+from factory.django import DjangoModelFactory
+
+from core.models import Actor, CinemaHall, Genre, Movie, MovieScreening, Seat, Ticket
+
+
+class ActorFactory(DjangoModelFactory):
+    class Meta:
+        model = Actor
+
+    name = Faker("name")
+    age = Faker("random_int", min=1, max=100)
+    nationality = Faker("country")
+
+
+class CinemaHallFactory(DjangoModelFactory):
+    class Meta:
+        model = CinemaHall
+
+    name = factory.Sequence(lambda n: f"Hall {n}")
+
+
+class GenreFactory(DjangoModelFactory):
+    class Meta:
+        model = Genre
+
+    name = Faker("word")
+    is_for_adults = Faker("pybool")
+
+
+class MovieFactory(DjangoModelFactory):
+    class Meta:
+        model = Movie
+        skip_postgeneration_save = True
+
+    title = Faker("sentence", nb_words=5)
+    duration = Faker("random_int", min=30, max=200)
+
+    @factory.post_generation
+    def genres(self, create, extracted, **kwargs):
+        if not create:
+            return
+
+        if extracted:
+            self.genres.add(*extracted)
+        else:
+            self.genres.add(GenreFactory())
+
+    @factory.post_generation
+    def actors(self, create, extracted, **kwargs):
+        if not create:
+            return
+
+        if extracted:
+            self.actors.add(*extracted)
+        else:
+            self.actors.add(ActorFactory())
+
+
+class MovieScreeningFactory(DjangoModelFactory):
+    class Meta:
+        model = MovieScreening
+
+    movie = factory.SubFactory(MovieFactory)
+    date = Faker("date_time", tzinfo=timezone.utc)
+    hall = factory.SubFactory(CinemaHallFactory)
+    period = factory.LazyAttribute(
+        lambda screening: MovieScreening.period_of(
+            screening.date, screening.movie.duration
+        )
+    )
+
+
+class SeatFactory(DjangoModelFactory):
+    class Meta:
+        model = Seat
+
+    # Walks a 25 x 40 grid so seats in one hall never share a position.
+    row = factory.Sequence(lambda n: n // 40 % 25 + 1)
+    number = factory.Sequence(lambda n: n % 40 + 1)
+    hall = SubFactory(CinemaHallFactory)
+
+
+class TicketFactory(DjangoModelFactory):
+    class Meta:
+        model = Ticket
+
+    movie_screening = SubFactory(MovieScreeningFactory)
+    seat = SubFactory(SeatFactory)
+    price = Faker("random_int", min=5, max=100)
+
+
+def bulk_create_batch(factory_class, size, batch_size=1000, **kwargs):
+    # Builds and inserts one batch at a time with a single bulk_create each.
+    # SubFactory parents are only built, so pass saved parents to reuse as
+    # keyword arguments, e.g. hall=factory.Iterator(halls).
+    model = factory_class._meta.model
+    created = []
+    while len(created) < size:
+        batch = factory_class.build_batch(
+            min(batch_size, size - len(created)), **kwargs
+        )
+        created += model.objects.bulk_create(batch)
+    return created
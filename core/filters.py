@@ -0,0 +1,75 @@
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db.models import Exists, OuterRef, Q
+from django_filters import rest_framework as filters
+
+from core.models import Actor, Movie, MovieScreening, Ticket
+
+# The "simple" configuration does no stemming or stop words, which suits names
+# and titles. Queries must build the same expression as the GIN indexes on
+# Movie.title and Actor.name, or Postgres will not use them.
+SEARCH_CONFIG = "simple"
+
+
+def search_vector(field):
+    return SearchVector(field, config=SEARCH_CONFIG)
+
+
+def search(queryset, field, value):
+    # Whole words go through the full-text index; partial or misspelled words
+    # fall back to trigram word similarity on the same column.
+    return queryset.alias(search=search_vector(field)).filter(
+        Q(search=SearchQuery(value, config=SEARCH_CONFIG))
+        | Q(**{f"{field}__trigram_word_similar": value})
+    )
+
+
+class MovieFilter(filters.FilterSet):
+    genre = filters.NumberFilter(field_name="genres")
+    actor = filters.NumberFilter(field_name="actors")
+    duration = filters.RangeFilter()
+    adult = filters.BooleanFilter(method="filter_adult")
+    search = filters.CharFilter(method="filter_search")
+
+    class Meta:
+        model = Movie
+        fields = ["genre", "actor", "duration", "adult", "search"]
+
+    def filter_adult(self, queryset, name, value):
+        adult = Exists(
+            Movie.genres.through.objects.filter(
+                movie=OuterRef("pk"), genre__is_for_adults=True
+            )
+        )
+        return queryset.filter(adult if value else ~adult)
+
+    def filter_search(self, queryset, name, value):
+        return search(queryset, "title", value)
+
+
+class ActorFilter(filters.FilterSet):
+    search = filters.CharFilter(method="filter_search")
+
+    class Meta:
+        model = Actor
+        fields = ["search"]
+
+    def filter_search(self, queryset, name, value):
+        return search(queryset, "name", value)
+
+
+class MovieScreeningFilter(filters.FilterSet):
+    date = filters.IsoDateTimeFromToRangeFilter()
+    hall = filters.NumberFilter()
+    movie = filters.NumberFilter()
+
+    class Meta:
+        model = MovieScreening
+        fields = ["date", "hall", "movie"]
+
+
+class TicketFilter(filters.FilterSet):
+    screening = filters.NumberFilter(field_name="movie_screening")
+
+    class Meta:
+        model = Ticket
+        fields = ["screening"]
@@ -0,0 +1,164 @@
+import secrets
+from datetime import timedelta
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.models import SeatHold
+from core.utils import load_backend
+
+
+class Hold(NamedTuple):
+    token: str
+    seat_ids: list
+    expires_at: object
+
+
+class BaseHoldBackend:
+    def __init__(self, **options):
+        self.options = options
+
+    def hold(self, screening_id, seat_ids, ttl):
+        """Hold every seat for ``ttl`` seconds or none; return a Hold or None."""
+        raise NotImplementedError
+
+    def held_seats(self, screening_id, seat_ids):
+        """Map each of ``seat_ids`` with an active hold to its hold token."""
+        raise NotImplementedError
+
+    async def aheld_seats(self, screening_id, seat_ids):
+        return await sync_to_async(self.held_seats)(screening_id, seat_ids)
+
+    def release(self, screening_id, token, seat_ids=None):
+        """Release the token's holds on the screening and return their seat ids."""
+        raise NotImplementedError
+
+    def reap(self):
+        """Drop expired holds in bulk and return how many were removed."""
+        return 0
+
+    def new_hold(self, seat_ids, ttl):
+        return Hold(
+            token=secrets.token_hex(16),
+            seat_ids=sorted(seat_ids),
+            expires_at=timezone.now() + timedelta(seconds=ttl),
+        )
+
+
+class DatabaseHoldBackend(BaseHoldBackend):
+    def hold(self, screening_id, seat_ids, ttl):
+        hold = self.new_hold(seat_ids, ttl)
+        try:
+            with transaction.atomic():
+                SeatHold.objects.filter(
+                    movie_screening_id=screening_id,
+                    seat_id__in=hold.seat_ids,
+                    expires_at__lte=timezone.now(),
+                ).delete()
+                SeatHold.objects.bulk_create(
+                    SeatHold(
+                        movie_screening_id=screening_id,
+                        seat_id=seat_id,
+                        token=hold.token,
+                        expires_at=hold.expires_at,
+                    )
+                    for seat_id in hold.seat_ids
+                )
+        except IntegrityError:
+            return None
+        return hold
+
+    def held_seats(self, screening_id, seat_ids):
+        return dict(
+            SeatHold.objects.filter(
+                movie_screening_id=screening_id,
+                seat_id__in=seat_ids,
+                expires_at__gt=timezone.now(),
+            ).values_list("seat_id", "token")
+        )
+
+    async def aheld_seats(self, screening_id, seat_ids):
+        holds = SeatHold.objects.filter(
+            movie_screening_id=screening_id,
+            seat_id__in=seat_ids,
+            expires_at__gt=timezone.now(),
+        ).values_list("seat_id", "token")
+        return {seat_id: token async for seat_id, token in holds}
+
+    def release(self, screening_id, token, seat_ids=None):
+        holds = SeatHold.objects.filter(movie_screening_id=screening_id, token=token)
+        if seat_ids is not None:
+            holds = holds.filter(seat_id__in=seat_ids)
+        released = list(holds.values_list("seat_id", flat=True))
+        holds.filter(seat_id__in=released).delete()
+        return released
+
+    def reap(self):
+        deleted, _ = SeatHold.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+
+class CacheHoldBackend(BaseHoldBackend):
+    # One cache entry per held seat plus one per token; entries expire natively.
+
+    @property
+    def cache(self):
+        return caches[self.options.get("CACHE", "default")]
+
+    def seat_key(self, screening_id, seat_id):
+        return f"seat-hold:{screening_id}:{seat_id}"
+
+    def token_key(self, token):
+        return f"seat-hold-token:{token}"
+
+    def hold(self, screening_id, seat_ids, ttl):
+        hold = self.new_hold(seat_ids, ttl)
+        claimed = []
+        for seat_id in hold.seat_ids:
+            key = self.seat_key(screening_id, seat_id)
+            if not self.cache.add(key, hold.token, timeout=ttl):
+                self.cache.delete_many(claimed)
+                return None
+            claimed.append(key)
+        self.cache.set(
+            self.token_key(hold.token), (screening_id, hold.seat_ids), timeout=ttl
+        )
+        return hold
+
+    def held_seats(self, screening_id, seat_ids):
+        keys = {self.seat_key(screening_id, seat_id): seat_id for seat_id in seat_ids}
+        return {
+            keys[key]: token for key, token in self.cache.get_many(list(keys)).items()
+        }
+
+    async def aheld_seats(self, screening_id, seat_ids):
+        keys = {self.seat_key(screening_id, seat_id): seat_id for seat_id in seat_ids}
+        found = await self.cache.aget_many(list(keys))
+        return {keys[key]: token for key, token in found.items()}
+
+    def release(self, screening_id, token, seat_ids=None):
+        entry = self.cache.get(self.token_key(token))
+        if entry is None or entry[0] != screening_id:
+            return []
+        held_ids = entry[1]
+        candidates = held_ids if seat_ids is None else set(held_ids) & set(seat_ids)
+        owned = self.held_seats(screening_id, candidates)
+        released = sorted(seat_id for seat_id, owner in owned.items() if owner == token)
+        self.cache.delete_many(
+            [self.seat_key(screening_id, seat_id) for seat_id in released]
+        )
+        if seat_ids is None or not set(held_ids) - set(seat_ids):
+            self.cache.delete(self.token_key(token))
+        return released
+
+
+def get_hold_backend():
+    return load_backend(settings.SEAT_HOLDS)
+
+
+def get_hold_ttl():
+    return settings.SEAT_HOLDS["TTL"]
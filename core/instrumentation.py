@@ -0,0 +1,176 @@
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+TIME_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+BUCKETS = {
+    "duration_ms": TIME_BUCKETS,
+    "db_ms": TIME_BUCKETS,
+    "render_ms": TIME_BUCKETS,
+    "queries": (1, 2, 3, 5, 10, 20, 50, 100),
+    "response_bytes": (1_000, 10_000, 100_000, 1_000_000),
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self):
+        cumulative, total = {}, 0
+        for bound, count in zip([*self.buckets, "+Inf"], self.counts):
+            total += count
+            cumulative[str(bound)] = total
+        return {"count": self.count, "sum": round(self.sum, 3), "buckets": cumulative}
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def observe(view, values):
+    with _lock:
+        histograms = _histograms.get(view)
+        if histograms is None:
+            histograms = _histograms[view] = {
+                name: Histogram(buckets) for name, buckets in BUCKETS.items()
+            }
+        for name, value in values.items():
+            histograms[name].observe(value)
+
+
+def request_stats():
+    with _lock:
+        return {
+            view: {name: histogram.as_dict() for name, histogram in metrics.items()}
+            for view, metrics in sorted(_histograms.items())
+        }
+
+
+def reset_request_stats():
+    with _lock:
+        _histograms.clear()
+
+
+class RequestMetrics:
+    # Installed as an execute wrapper on every connection for one request.
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.render_started = None
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - started) * 1000))
+
+    def installed(self):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+    def finish(self, request, response):
+        ended = time.perf_counter()
+        config = settings.REQUEST_METRICS
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        db_ms = sum(duration for _, duration in self.queries)
+        render_ms = (ended - self.render_started) * 1000 if self.render_started else 0.0
+        duration_ms = (ended - self.started) * 1000
+        values = {
+            "duration_ms": duration_ms,
+            "db_ms": db_ms,
+            "render_ms": render_ms,
+            "queries": len(self.queries),
+        }
+        if not response.streaming:
+            values["response_bytes"] = len(response.content)
+        observe(view, values)
+
+        if config["SERVER_TIMING"]:
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.2f};desc="{len(self.queries)} queries", '
+                f"render;dur={render_ms:.2f}, total;dur={duration_ms:.2f}"
+            )
+        self.report(view, config)
+        return response
+
+    def report(self, view, config):
+        for sql, duration in self.queries:
+            if duration >= config["SLOW_QUERY_MS"]:
+                logger.warning("Slow query in %s (%.1f ms): %s", view, duration, sql)
+        repeated = Counter(sql for sql, _ in self.queries)
+        for sql, count in repeated.most_common():
+            if count < config["DUPLICATE_QUERIES"]:
+                break
+            logger.warning("%s ran the same query %d times: %s", view, count, sql)
+
+
+def sampled():
+    rate = settings.REQUEST_METRICS["SAMPLE_RATE"]
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+class RequestMetricsMiddleware:
+    # Records query count, DB time, render time and response size for a
+    # sample of requests. Unsampled requests only pay for one settings lookup.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not sampled():
+            return self.get_response(request)
+        request.metrics = metrics = RequestMetrics()
+        with metrics.installed():
+            response = self.get_response(request)
+        return metrics.finish(request, response)
+
+    async def __acall__(self, request):
+        if not sampled():
+            return await self.get_response(request)
+        request.metrics = metrics = RequestMetrics()
+        # The ORM runs async queries in the request's sync thread, so the
+        # wrappers go onto that thread's connections.
+        installed = await sync_to_async(metrics.installed)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(installed.close)()
+        return metrics.finish(request, response)
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook returns.
+        metrics = getattr(request, "metrics", None)
+        if metrics is not None:
+            metrics.render_started = time.perf_counter()
+        return response
@@ -0,0 +1,38 @@
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from core.counters import recount_halls
+from core.models import CinemaHall, Seat, Ticket
+
+
+def expand_layout(rows):
+    return [
+        Seat(row=spec["row"], number=number)
+        for spec in rows
+        for number in range(1, spec["seats"] + 1)
+        if number not in spec["gaps"]
+    ]
+
+
+def create_layout(hall, rows, replace=False):
+    seats = expand_layout(rows)
+    with transaction.atomic():
+        CinemaHall.objects.select_for_update().filter(pk=hall.pk).exists()
+        existing = Seat.objects.filter(hall=hall)
+        deleted = 0
+        if existing.exists():
+            if not replace:
+                raise ValidationError(
+                    {"replace": "Hall already has seats; set replace to overwrite."}
+                )
+            if Ticket.objects.filter(seat__hall=hall).exists():
+                raise ValidationError(
+                    {"replace": "Hall has sold tickets; its layout cannot be replaced."}
+                )
+            _, counts = existing.delete()
+            deleted = counts.get(Seat._meta.label, 0)
+        for seat in seats:
+            seat.hall = hall
+        Seat.objects.bulk_create(seats, batch_size=1000)
+        recount_halls([hall.pk])
+    return {"created": len(seats), "deleted": deleted}
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from core.parsers import CSVParser
+from core.serializers import ScheduleImportSerializer
+
+PARSERS = {"csv": CSVParser, "json": JSONParser}
+
+
+class Command(BaseCommand):
+    help = "Import or update screenings from a CSV or JSON schedule"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV with a movie,hall,date header or JSON")
+        parser.add_argument(
+            "--format",
+            choices=sorted(PARSERS),
+            help="Defaults to the file's extension",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        fmt = options["format"] or path.suffix.lstrip(".").lower()
+        if fmt not in PARSERS:
+            raise CommandError("Cannot tell the format, use --format.")
+        try:
+            with path.open("rb") as stream:
+                rows = PARSERS[fmt]().parse(stream)
+        except (OSError, ParseError) as exc:
+            raise CommandError(exc)
+        if isinstance(rows, dict):
+            rows = rows.get("screenings", [])
+
+        imported, errors = 0, {}
+        size = ScheduleImportSerializer.max_rows
+        for offset in range(0, len(rows), size):
+            serializer = ScheduleImportSerializer(
+                data={"screenings": rows[offset : offset + size]}
+            )
+            if not serializer.is_valid():
+                raise CommandError(serializer.errors)
+            result = serializer.save()
+            imported += result["imported"]
+            errors.update(
+                (offset + row, error) for row, error in result["errors"].items()
+            )
+        for row, error in errors.items():
+            self.stderr.write(f"Row {row}: {dict(error)}")
+        self.stdout.write(f"Imported {imported} screenings, rejected {len(errors)}")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.holds import get_hold_backend
+
+
+class Command(BaseCommand):
+    help = "Delete expired seat holds in bulk"
+
+    def handle(self, *args, **options):
+        reaped = get_hold_backend().reap()
+        self.stdout.write(f"Reaped {reaped} expired seat holds")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Find and recount screenings whose seat counters drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the drifted screenings",
+        )
+
+    def handle(self, *args, **options):
+        drifted = reconcile_counters(dry_run=options["dry_run"])
+        for pk in drifted:
+            self.stderr.write(f"Screening {pk} drifted")
+        action = "Found" if options["dry_run"] else "Recounted"
+        self.stdout.write(f"{action} {len(drifted)} drifted screenings")
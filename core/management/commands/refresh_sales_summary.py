@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.reports import refresh_sales_summary
+
+
+class Command(BaseCommand):
+    help = "Refresh the per-screening sales summary used by revenue reports"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute every screening instead of the ones changed since "
+            "the last refresh",
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_sales_summary(full=options["full"])
+        self.stdout.write(f"Refreshed sales of {refreshed} screenings")
@@ -0,0 +1,33 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from core.seeding import SCALES, is_seeded, seed
+
+
+class Command(BaseCommand):
+    help = "Seed the database with a large synthetic cinema dataset"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument(
+            "--flush", action="store_true", help="Flush the database first"
+        )
+        for name, value in SCALES["small"].items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                type=type(value),
+                dest=name,
+                help=f"Override the scale's {name.replace('_', ' ')}",
+            )
+
+    def handle(self, *args, **options):
+        config = {
+            name: value if options[name] is None else options[name]
+            for name, value in SCALES[options["scale"]].items()
+        }
+        if options["flush"]:
+            call_command("flush", interactive=False, verbosity=0)
+        elif is_seeded():
+            raise CommandError("The database already has screenings, use --flush.")
+        seed(config, random_seed=options["seed"], log=self.stdout.write)
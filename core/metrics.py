@@ -0,0 +1,375 @@
+import fcntl
+import itertools
+import mmap
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from struct import pack_into, unpack_from
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+# Every thread writes to its own shard, so increments need no lock, and the
+# shard of a finished thread is handed to the next new one. With
+# METRICS["DIRECTORY"] set, shards are memory-mapped files named after the
+# process; /metrics sums the files of all gunicorn workers and folds those of
+# exited workers into one archive file. Without it, shards are plain dicts
+# and only this process is reported.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class MemoryShard:
+    def __init__(self):
+        self.values = {}
+
+    def inc(self, key, amount):
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def read(self):
+        return self.values.copy()
+
+
+class FileShard:
+    # Layout: a 4-byte used-length header, then entries of a 4-byte key length,
+    # the key, padding to 8 bytes and a double. The header is bumped only after
+    # an entry is written, so readers never see a partial one.
+    initial_size = 1 << 16
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "x+b")
+        self.file.truncate(self.initial_size)
+        self.map = mmap.mmap(self.file.fileno(), self.initial_size)
+        self.used = 8
+        self.offsets = {}
+        pack_into("i", self.map, 0, self.used)
+
+    def add(self, key):
+        encoded = key.encode()
+        offset = (self.used + 4 + len(encoded) + 7) & ~7
+        if offset + 8 > len(self.map):
+            size = max(len(self.map) * 2, offset + 8)
+            self.file.truncate(size)
+            self.map.resize(size)
+        pack_into(f"i{len(encoded)}s", self.map, self.used, len(encoded), encoded)
+        pack_into("d", self.map, offset, 0.0)
+        self.used = offset + 8
+        pack_into("i", self.map, 0, self.used)
+        self.offsets[key] = offset
+        return offset
+
+    def inc(self, key, amount):
+        offset = self.offsets.get(key)
+        if offset is None:
+            offset = self.add(key)
+        pack_into("d", self.map, offset, unpack_from("d", self.map, offset)[0] + amount)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+def read_shard_file(path):
+    data = Path(path).read_bytes()
+    values = {}
+    if len(data) < 8:
+        return values
+    used = unpack_from("i", data, 0)[0]
+    position = 8
+    while position < used:
+        length = unpack_from("i", data, position)[0]
+        key = data[position + 4 : position + 4 + length].decode()
+        offset = (position + 4 + length + 7) & ~7
+        values[key] = unpack_from("d", data, offset)[0]
+        position = offset + 8
+    return values
+
+
+ARCHIVE = "metrics-archive.db"
+
+_local = threading.local()
+_shards = []
+_free = []
+_shards_lock = threading.Lock()
+_sequence = itertools.count()
+
+
+def _reset_after_fork():
+    global _local
+    _local = threading.local()
+    _shards.clear()
+    _free.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_directory():
+    return settings.METRICS["DIRECTORY"]
+
+
+def new_file_shard(directory):
+    # A restarted process with a recycled pid just picks a new name.
+    while True:
+        path = os.path.join(directory, f"metrics-{os.getpid()}-{next(_sequence)}.db")
+        try:
+            return FileShard(path)
+        except FileExistsError:
+            continue
+
+
+class ShardOwner:
+    # Kept in the thread's local storage, which is dropped when the thread
+    # exits; the shard then goes back to the free list.
+    def __init__(self, directory, shard):
+        weakref.finalize(self, _free.append, (directory, shard))
+
+
+def take_shard(directory):
+    with _shards_lock:
+        for index, (free_directory, shard) in enumerate(_free):
+            if free_directory == directory:
+                return _free.pop(index)[1]
+    shard = new_file_shard(directory) if directory else MemoryShard()
+    with _shards_lock:
+        _shards.append(shard)
+    return shard
+
+
+def get_shard():
+    directory = get_directory()
+    shard = getattr(_local, "shard", None)
+    if shard is None or _local.directory != directory:
+        shard = take_shard(directory)
+        _local.shard, _local.directory = shard, directory
+        _local.owner = ShardOwner(directory, shard)
+    return shard
+
+
+@lru_cache(maxsize=4096)
+def series_key(name, labels):
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def archive_exited(directory):
+    # Sums the files of exited processes into the archive and removes them,
+    # so the directory stays as small as the set of live workers. The lock
+    # keeps concurrent scrapes from archiving the same file twice.
+    directory = Path(directory)
+    with open(directory / "metrics.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        exited = [
+            path
+            for path in directory.glob("metrics-*-*.db")
+            if not is_running(int(path.name.split("-")[1]))
+        ]
+        if not exited:
+            return
+        archive = directory / ARCHIVE
+        totals = defaultdict(float)
+        for path in [archive, *exited] if archive.exists() else exited:
+            for key, value in read_shard_file(path).items():
+                totals[key] += value
+        staging = directory / f"staging-{os.getpid()}.db"
+        staging.unlink(missing_ok=True)
+        shard = FileShard(staging)
+        for key, value in totals.items():
+            shard.inc(key, value)
+        shard.close()
+        os.replace(staging, archive)
+        for path in exited:
+            path.unlink()
+
+
+def collect():
+    directory = get_directory()
+    totals = defaultdict(float)
+    if directory:
+        archive_exited(directory)
+        for path in Path(directory).glob("metrics-*.db"):
+            for key, value in read_shard_file(path).items():
+                totals[key] += value
+    else:
+        with _shards_lock:
+            shards = [shard for shard in _shards if isinstance(shard, MemoryShard)]
+        for shard in shards:
+            for key, value in shard.read().items():
+                totals[key] += value
+    return totals
+
+
+def reset_metrics():
+    with _shards_lock:
+        for shard in _shards:
+            if isinstance(shard, MemoryShard):
+                shard.values.clear()
+
+
+registry = {}
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        registry[name] = self
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        get_shard().inc(series_key(self.name, tuple(sorted(labels.items()))), amount)
+
+    def samples(self, values):
+        prefix = self.name + "{"
+        return [
+            (key, value)
+            for key, value in values.items()
+            if key == self.name or key.startswith(prefix)
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(buckets)
+        self.bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+
+    def observe(self, value, **labels):
+        shard = get_shard()
+        labels = tuple(sorted(labels.items()))
+        bound = self.bounds[bisect_left(self.buckets, value)]
+        shard.inc(series_key(self.name + "_bucket", labels + (("le", bound),)), 1)
+        shard.inc(series_key(self.name + "_sum", labels), value)
+        shard.inc(series_key(self.name + "_count", labels), 1)
+
+    def time(self, **labels):
+        return Timer(self, labels)
+
+    def samples(self, values):
+        # Buckets are stored per bound and made cumulative here.
+        prefix = self.name + "_bucket"
+        buckets = defaultdict(dict)
+        samples = []
+        for key, value in values.items():
+            if key.startswith(prefix):
+                labels, bound = key[len(prefix) :].rsplit('le="', 1)
+                buckets[labels][bound[:-2]] = value
+            elif key.startswith((self.name + "_sum", self.name + "_count")):
+                samples.append((key, value))
+        for labels, counts in sorted(buckets.items()):
+            total = 0
+            for bound in self.bounds:
+                total += counts.get(bound, 0)
+                samples.append((f'{prefix}{labels}le="{bound}"}}', total))
+        return samples
+
+
+class Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+
+
+def render_metrics():
+    values = collect()
+    lines = []
+    for name, metric in sorted(registry.items()):
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        lines.extend(f"{key} {float(value)!r}" for key, value in metric.samples(values))
+    return "\n".join(lines) + "\n"
+
+
+TICKETS_SOLD = Counter("tickets_sold_total", "Tickets sold.")
+BOOKING_CONFLICTS = Counter(
+    "booking_conflicts_total", "Seat purchases, moves and holds turned away, by reason."
+)
+SEAT_MAP_SECONDS = Histogram(
+    "seat_map_duration_seconds", "Time spent building a screening's seat map."
+)
+RESPONSE_CACHE_REQUESTS = Counter(
+    "response_cache_requests_total", "Cached catalog reads, by view and result."
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency, by route and method."
+)
+HTTP_RESPONSES = Counter("http_responses_total", "Responses, by route and status.")
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "SQL query latency, by database alias.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+
+def observe_query(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        DB_QUERY_SECONDS.observe(
+            time.perf_counter() - started, database=context["connection"].alias
+        )
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, started)
+        return response
+
+    def observe(self, request, response, started):
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, view=view, method=request.method
+        )
+        HTTP_RESPONSES.inc(view=view, status=response.status_code)
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 10:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        # Seats sold twice before the constraint existed stay with the oldest
+        # ticket; the later ones keep their sale but lose the seat, so they can
+        # be found with seat IS NULL and reseated or refunded by hand.
+        migrations.RunSQL(
+            """
+            UPDATE core_ticket AS ticket SET seat_id = NULL
+            WHERE EXISTS (
+                SELECT 1 FROM core_ticket AS other
+                WHERE other.movie_screening_id = ticket.movie_screening_id
+                AND other.seat_id = ticket.seat_id
+                AND other.id < ticket.id
+            )
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                fields=("movie_screening", "seat"),
+                name="unique_ticket_per_screening_seat",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_seathold"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="moviescreening",
+            name="date",
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
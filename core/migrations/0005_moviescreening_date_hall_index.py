@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_moviescreening_date_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="moviescreening",
+            name="date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="moviescreening",
+            index=models.Index(fields=["date", "hall"], name="screening_date_hall_idx"),
+        ),
+    ]
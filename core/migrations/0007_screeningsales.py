@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 11:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScreeningSales",
+            fields=[
+                (
+                    "movie_screening",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="sales",
+                        serialize=False,
+                        to="core.moviescreening",
+                    ),
+                ),
+                ("ticket_count", models.PositiveIntegerField()),
+                (
+                    "ticket_revenue",
+                    models.PositiveIntegerField(help_text="Revenue in PLN"),
+                ),
+                ("refreshed_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2 on 2026-10-18 11:11
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_screeningsales"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        migrations.AddIndex(
+            model_name="actor",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector("name", config="simple"),
+                name="actor_name_search_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="actor",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="actor_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(fields=["duration"], name="movie_duration_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector("title", config="simple"),
+                name="movie_title_search_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["title"],
+                name="movie_title_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="moviescreening",
+            index=models.Index(fields=["hall", "date"], name="screening_hall_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="moviescreening",
+            index=models.Index(
+                fields=["movie", "date"], name="screening_movie_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-18 11:32
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.operations
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_search_and_filter_indexes"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.BtreeGistExtension(),
+        migrations.AddField(
+            model_name="moviescreening",
+            name="period",
+            field=django.contrib.postgres.fields.ranges.DateTimeRangeField(null=True),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE core_moviescreening AS screening
+            SET period = tstzrange(
+                screening.date, screening.date + movie.duration * interval '1 minute'
+            )
+            FROM core_movie AS movie
+            WHERE movie.id = screening.movie_id
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name="moviescreening",
+            name="period",
+            field=django.contrib.postgres.fields.ranges.DateTimeRangeField(),
+        ),
+        migrations.AddConstraint(
+            model_name="moviescreening",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                expressions=[("hall", "="), ("period", "&&")],
+                name="exclude_overlapping_screenings",
+            ),
+        ),
+    ]
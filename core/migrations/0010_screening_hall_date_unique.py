@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_screening_period"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="moviescreening",
+            name="screening_hall_date_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="moviescreening",
+            constraint=models.UniqueConstraint(
+                fields=("hall", "date"), name="unique_screening_per_hall_date"
+            ),
+        ),
+    ]
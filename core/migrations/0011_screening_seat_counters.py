@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-18 11:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_screening_hall_date_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="moviescreening",
+            name="seats_sold",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="moviescreening",
+            name="seats_total",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE core_moviescreening AS screening
+            SET seats_total = (
+                    SELECT count(*) FROM core_seat AS seat
+                    WHERE seat.hall_id = screening.hall_id
+                ),
+                seats_sold = (
+                    SELECT count(*) FROM core_ticket AS ticket
+                    WHERE ticket.movie_screening_id = screening.id
+                    AND ticket.seat_id IS NOT NULL
+                )
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2 on 2026-10-18 11:56
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_screening_seat_counters"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="seat",
+            name="number",
+            field=models.PositiveSmallIntegerField(
+                validators=[django.core.validators.MinValueValidator(1)]
+            ),
+        ),
+        migrations.AlterField(
+            model_name="seat",
+            name="row",
+            field=models.PositiveSmallIntegerField(
+                validators=[django.core.validators.MinValueValidator(1)]
+            ),
+        ),
+        # Seats numbered from 0 or repeating a position cannot be placed on a
+        # seat map. Unsold ones are dropped, keeping the oldest seat at each
+        # position, and the halls recounted; sold ones fail the constraints
+        # below and have to be fixed by hand.
+        migrations.RunSQL(
+            [
+                """
+                CREATE TEMPORARY TABLE invalid_seat ON COMMIT DROP AS
+                SELECT seat.id FROM core_seat AS seat
+                WHERE (
+                    seat.row = 0
+                    OR seat.number = 0
+                    OR EXISTS (
+                        SELECT 1 FROM core_seat AS other
+                        WHERE other.hall_id = seat.hall_id
+                        AND other.row = seat.row
+                        AND other.number = seat.number
+                        AND other.id < seat.id
+                    )
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM core_ticket AS ticket WHERE ticket.seat_id = seat.id
+                )
+                """,
+                "DELETE FROM core_seathold WHERE seat_id IN (SELECT id FROM invalid_seat)",
+                "DELETE FROM core_seat WHERE id IN (SELECT id FROM invalid_seat)",
+                # Runs the deferred foreign key checks now, as Postgres will
+                # not alter a table with pending trigger events.
+                "SET CONSTRAINTS ALL IMMEDIATE",
+                """
+                UPDATE core_moviescreening AS screening
+                SET seats_total = (
+                    SELECT count(*) FROM core_seat AS seat
+                    WHERE seat.hall_id = screening.hall_id
+                )
+                """,
+            ],
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="seat",
+            constraint=models.UniqueConstraint(
+                fields=("hall", "row", "number"), name="unique_seat_per_hall_position"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="seat",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("number__gte", 1), ("row__gte", 1)),
+                name="seat_position_from_one",
+            ),
+        ),
+    ]
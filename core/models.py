@@ -1,5 +1,13 @@
+from datetime import timedelta
+
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
 
 
 class User(AbstractUser):
@@ -9,12 +17,24 @@ class User(AbstractUser):
 class Genre(models.Model):
     name = models.CharField(max_length=50)
     is_for_adults = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
 
 class Actor(models.Model):
     name = models.CharField(max_length=80)
     age = models.PositiveSmallIntegerField(help_text="Age of the actor in years")
     nationality = models.CharField(max_length=54)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                SearchVector("name", config="simple"), name="actor_name_search_idx"
+            ),
+            GinIndex(
+                fields=["name"], opclasses=["gin_trgm_ops"], name="actor_name_trgm_idx"
+            ),
+        ]
 
 
 class Movie(models.Model):
@@ -22,16 +42,44 @@ class Movie(models.Model):
     genres = models.ManyToManyField(Genre, related_name="movies")
     actors = models.ManyToManyField(Actor, related_name="movies")
     duration = models.PositiveIntegerField(help_text="Duration of the movie in minutes")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["duration"], name="movie_duration_idx"),
+            GinIndex(
+                SearchVector("title", config="simple"), name="movie_title_search_idx"
+            ),
+            GinIndex(
+                fields=["title"],
+                opclasses=["gin_trgm_ops"],
+                name="movie_title_trgm_idx",
+            ),
+        ]
 
 
 class CinemaHall(models.Model):
     name = models.CharField(max_length=20)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
 
 class Seat(models.Model):
-    row = models.PositiveSmallIntegerField()
-    number = models.PositiveSmallIntegerField()
+    row = models.PositiveSmallIntegerField(validators=[MinValueValidator(1)])
+    number = models.PositiveSmallIntegerField(validators=[MinValueValidator(1)])
     hall = models.ForeignKey(CinemaHall, on_delete=models.PROTECT, related_name="seat")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            # Seat maps place each seat at its 1-based (row, number) position.
+            models.UniqueConstraint(
+                fields=["hall", "row", "number"], name="unique_seat_per_hall_position"
+            ),
+            models.CheckConstraint(
+                condition=models.Q(row__gte=1, number__gte=1),
+                name="seat_position_from_one",
+            ),
+        ]
 
 
 class MovieScreening(models.Model):
@@ -42,6 +90,56 @@ class MovieScreening(models.Model):
     hall = models.ForeignKey(
         CinemaHall, on_delete=models.PROTECT, related_name="movie_screening"
     )
+    # [date, date + movie duration), kept in step by save() and the scheduling
+    # helpers so the database can refuse overlapping screenings in a hall.
+    period = DateTimeRangeField()
+    # Denormalized counts of the hall's seats and of sold seated tickets, see
+    # core.counters.
+    seats_total = models.PositiveIntegerField(default=0)
+    seats_sold = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "hall"], name="screening_date_hall_idx"),
+            models.Index(fields=["movie", "date"], name="screening_movie_date_idx"),
+        ]
+        constraints = [
+            # The key schedule imports upsert on.
+            models.UniqueConstraint(
+                fields=["hall", "date"], name="unique_screening_per_hall_date"
+            ),
+            ExclusionConstraint(
+                name="exclude_overlapping_screenings",
+                expressions=[
+                    ("hall", RangeOperators.EQUAL),
+                    ("period", RangeOperators.OVERLAPS),
+                ],
+            ),
+        ]
+
+    @staticmethod
+    def period_of(date, duration):
+        return DateTimeTZRange(date, date + timedelta(minutes=duration))
+
+    def save(self, *args, **kwargs):
+        self.period = self.period_of(self.date, self.movie.duration)
+        self.seats_total = Seat.objects.filter(hall_id=self.hall_id).count()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {
+                *kwargs["update_fields"],
+                "period",
+                "seats_total",
+            }
+        elif not self._state.adding:
+            # seats_sold only moves through F() updates; writing back a stale
+            # copy would lose concurrent sales.
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "seats_sold"
+            ]
+        super().save(*args, **kwargs)
 
 
 class Ticket(models.Model):
@@ -52,3 +150,43 @@ class Ticket(models.Model):
         Seat, on_delete=models.SET_NULL, null=True, related_name="ticket"
     )
     price = models.PositiveSmallIntegerField(help_text="Price of the ticket in PLN")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["movie_screening", "seat"],
+                name="unique_ticket_per_screening_seat",
+            )
+        ]
+
+
+class SeatHold(models.Model):
+    movie_screening = models.ForeignKey(
+        MovieScreening, on_delete=models.CASCADE, related_name="seat_hold"
+    )
+    seat = models.ForeignKey(Seat, on_delete=models.CASCADE, related_name="seat_hold")
+    token = models.CharField(max_length=32, db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["movie_screening", "seat"],
+                name="unique_hold_per_screening_seat",
+            )
+        ]
+
+
+class ScreeningSales(models.Model):
+    # Per-screening ticket totals, refreshed in bulk by refresh_sales_summary so
+    # long-range revenue reports do not have to scan the ticket table.
+    movie_screening = models.OneToOneField(
+        MovieScreening,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="sales",
+    )
+    ticket_count = models.PositiveIntegerField()
+    ticket_revenue = models.PositiveIntegerField(help_text="Revenue in PLN")
+    refreshed_at = models.DateTimeField(db_index=True)
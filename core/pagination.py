@@ -0,0 +1,36 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.http import Http404
+from rest_framework import pagination
+
+
+class CursorPagination(pagination.CursorPagination):
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "ordering", None) or self.ordering
+        return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+
+
+def encode_keyset(date, pk):
+    return urlsafe_b64encode(f"{date.isoformat()}|{pk}".encode()).decode()
+
+
+def decode_keyset(cursor):
+    try:
+        date, pk = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(date), int(pk)
+    except ValueError:
+        raise Http404("Invalid cursor")
+
+
+def get_page_size(request):
+    try:
+        size = int(request.GET.get(CursorPagination.page_size_query_param, ""))
+    except ValueError:
+        return settings.REST_FRAMEWORK["PAGE_SIZE"]
+    return min(max(size, 1), CursorPagination.max_page_size)
@@ -0,0 +1,99 @@
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count
+from django.utils import timezone
+
+from core.models import Seat
+from core.utils import load_backend
+
+
+class PriceRules:
+    # A price is the base price times factors for the screening's start hour
+    # and weekday, the seat's row zone and the share of seats already sold.
+    # Everything that depends on the screening alone is compiled once into a
+    # table of prices per occupancy band and zone, so quoting a whole seat map
+    # is a lookup per row and a list comprehension over the seats.
+
+    def __init__(self, base, time_slots, weekdays, zones, occupancy, cache_size=4096):
+        if time_slots[0][0] != 0 or len(weekdays) != 7:
+            raise ImproperlyConfigured(
+                "Time slots must start at hour 0 and weekdays list 7 factors."
+            )
+        if zones[-1][0] < 1 or occupancy[-1][0] < 1:
+            raise ImproperlyConfigured("Zones and occupancy bands must reach 1.")
+        self.base = base
+        self.slot_hours, self.slot_factors = zip(*time_slots)
+        self.weekdays = weekdays
+        self.zone_limits, self.zone_factors = zip(*zones)
+        self.band_limits, self.band_factors = zip(*occupancy)
+        self.table = lru_cache(maxsize=cache_size)(self.compile)
+
+    def compile(self, screening_id, date):
+        # The id only keys the cache; a rescheduled screening compiles anew.
+        # The last column prices tickets without a seat, which have no zone.
+        start = timezone.localtime(date)
+        slot = bisect_right(self.slot_hours, start.hour) - 1
+        price = self.base * self.slot_factors[slot] * self.weekdays[start.weekday()]
+        return tuple(
+            tuple(round(price * band * zone) for zone in self.zone_factors + (1,))
+            for band in self.band_factors
+        )
+
+    def band(self, sold, total):
+        share = sold / total if total else 0
+        return min(bisect_left(self.band_limits, share), len(self.band_limits) - 1)
+
+    def zone(self, index, count):
+        # Rows are zoned by their position from the screen, not their number.
+        return min(
+            bisect_left(self.zone_limits, (index + 1) / count),
+            len(self.zone_limits) - 1,
+        )
+
+    def row_prices(self, screening, rows, sold, total):
+        prices = self.table(screening.pk, screening.date)[self.band(sold, total)]
+        row_prices = {
+            row: prices[self.zone(index, len(rows))] for index, row in enumerate(rows)
+        }
+        row_prices[None] = prices[-1]
+        return row_prices
+
+
+def get_price_rules():
+    return load_backend(settings.PRICING, "RULES")
+
+
+def quote_seats(screening, seats):
+    # Prices for seat map rows of (id, row, number, sold), in the same order.
+    rows = sorted({row for _, row, _, _ in seats})
+    sold = sum(1 for _, _, _, is_sold in seats if is_sold)
+    prices = get_price_rules().row_prices(screening, rows, sold, len(seats))
+    return [prices[row] for _, row, _, _ in seats]
+
+
+def quote(screening, seat_rows):
+    # Maps each seat id in ``seat_rows`` to its price; a None row is a ticket
+    # without a seat. Occupancy is what was sold before this purchase, as counted
+    # by the screening's seats_sold when it was loaded.
+    rows = list(
+        Seat.objects.filter(hall_id=screening.hall_id)
+        .values("row")
+        .annotate(seats=Count("pk"))
+        .order_by("row")
+        .values_list("row", "seats")
+    )
+    prices = get_price_rules().row_prices(
+        screening,
+        [row for row, _ in rows],
+        screening.seats_sold,
+        sum(seats for _, seats in rows),
+    )
+    return {seat_id: prices[row] for seat_id, row in seat_rows.items()}
+
+
+def quote_seat(screening, seat):
+    seat_id, row = (seat.pk, seat.row) if seat is not None else (None, None)
+    return quote(screening, {seat_id: row})[seat_id]
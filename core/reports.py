@@ -0,0 +1,163 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import (
+    Count,
+    DecimalField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Func,
+    IntegerField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Window,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf, Rank, Round, TruncDate
+from django.utils import timezone
+
+from core.models import MovieScreening, ScreeningSales, Ticket
+from core.schedule import count_of, schedule
+
+# Tickets written by transactions that were still open when a refresh started
+# carry an older updated_at, so every refresh looks back a little further.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+GROUPS = {
+    "movie": {
+        "movie": F("movie_screening__movie"),
+        "movie_title": F("movie_screening__movie__title"),
+    },
+    "day": {"day": TruncDate("movie_screening__date")},
+    "hall": {
+        "hall": F("movie_screening__hall"),
+        "hall_name": F("movie_screening__hall__name"),
+    },
+}
+
+
+class WindowSum(Func):
+    # SUM() over an aggregate; Django's Sum refuses to wrap another aggregate.
+    function = "SUM"
+    window_compatible = True
+    output_field = IntegerField()
+
+
+class OverWindow(ExpressionWrapper):
+    # An expression built on a window function; unlike a bare Window it would
+    # otherwise be added to GROUP BY.
+    def get_group_by_cols(self):
+        return []
+
+
+def percentage(part, whole):
+    return Cast(
+        Round(
+            Cast(part, DecimalField(max_digits=20, decimal_places=4))
+            * 100
+            / NullIf(whole, 0),
+            2,
+        ),
+        FloatField(),
+    )
+
+
+def sum_of(queryset, field, total):
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values(field)
+            .annotate(total=Sum(total))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def revenue(date_from, date_to, hall=None, genre=None, group=("movie",), summary=None):
+    if summary is None:
+        summary = settings.REPORTS["SUMMARY"]
+    if summary:
+        rows = ScreeningSales.objects.all()
+        tickets, total = Sum("ticket_count"), Sum("ticket_revenue")
+    else:
+        rows = Ticket.objects.all()
+        tickets, total = Count("pk"), Sum("price")
+    rows = rows.filter(
+        movie_screening__date__gte=date_from, movie_screening__date__lt=date_to
+    )
+    if hall is not None:
+        rows = rows.filter(movie_screening__hall_id=hall)
+    if genre is not None:
+        rows = rows.filter(movie_screening__movie__genres=genre)
+    keys = {
+        name: expression for key in group for name, expression in GROUPS[key].items()
+    }
+    return (
+        rows.values(**keys)
+        .annotate(tickets=tickets, revenue=total)
+        .annotate(
+            share=OverWindow(
+                percentage(F("revenue"), Window(WindowSum(F("revenue")))),
+                output_field=FloatField(),
+            ),
+            rank=Window(Rank(), order_by=F("revenue").desc()),
+        )
+        .order_by(*group)
+    )
+
+
+def occupancy(date_from, date_to, hall=None, genre=None):
+    return schedule(date_from, date_to, hall=hall, genre=genre).annotate(
+        revenue=sum_of(
+            Ticket.objects.filter(movie_screening=OuterRef("pk")),
+            "movie_screening",
+            "price",
+        ),
+        occupancy=percentage(F("seats_sold"), F("seats_total")),
+    )
+
+
+def refresh_sales_summary(full=False):
+    # Recomputes the totals of every screening touched since the last refresh,
+    # or of all screenings. Ticket deletes touch their screening (see signals).
+    started = timezone.now()
+    screenings = MovieScreening.objects.all()
+    last = ScreeningSales.objects.aggregate(last=Max("refreshed_at"))["last"]
+    if not full and last is not None:
+        since = last - REFRESH_OVERLAP
+        screenings = screenings.filter(
+            Q(updated_at__gte=since)
+            | Q(sales__isnull=True)
+            | Exists(
+                Ticket.objects.filter(
+                    movie_screening=OuterRef("pk"), updated_at__gte=since
+                )
+            )
+        )
+    tickets = Ticket.objects.filter(movie_screening=OuterRef("pk"))
+    rows = screenings.annotate(
+        ticket_count=count_of(tickets, "movie_screening"),
+        ticket_revenue=sum_of(tickets, "movie_screening", "price"),
+    ).values_list("pk", "ticket_count", "ticket_revenue")
+    refreshed = ScreeningSales.objects.bulk_create(
+        (
+            ScreeningSales(
+                movie_screening_id=pk,
+                ticket_count=count,
+                ticket_revenue=total,
+                refreshed_at=started,
+            )
+            for pk, count, total in rows.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+        update_conflicts=True,
+        unique_fields=["movie_screening"],
+        update_fields=["ticket_count", "ticket_revenue", "refreshed_at"],
+    )
+    return len(refreshed)
@@ -0,0 +1,141 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_COOKIE = "db_primary"
+
+
+class Route:
+    # One request's replica, until the request writes.
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+
+_route = ContextVar("replica_route", default=None)
+
+
+@contextmanager
+def routed(replica):
+    route = Route(replica)
+    token = _route.set(route)
+    try:
+        yield route
+    finally:
+        _route.reset(token)
+
+
+def get_replicas():
+    return settings.DATABASE_REPLICAS["ALIASES"]
+
+
+@contextmanager
+def on_primary():
+    token = _route.set(None)
+    try:
+        yield
+    finally:
+        _route.reset(token)
+
+
+def is_pinned(request):
+    return PIN_COOKIE in request.COOKIES
+
+
+class ReplicaRouter:
+    # Reads outside a routed request, inside a transaction or after a write
+    # stay on the primary, so code never reads older data than it wrote.
+
+    def db_for_read(self, model, **hints):
+        route = _route.get()
+        if (
+            route is None
+            or route.wrote
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return route.replica
+
+    def db_for_write(self, model, **hints):
+        route = _route.get()
+        if route is not None:
+            route.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def stream_from(route, content):
+    # Streamed bodies are read after the middleware returns, so every chunk
+    # is pulled with the request's route put back.
+    content = iter(content)
+    while True:
+        token = _route.set(route)
+        try:
+            chunk = next(content, None)
+        finally:
+            _route.reset(token)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class ReplicaRoutingMiddleware:
+    # Safe requests read from a random replica. Any other request, and a
+    # safe one that writes, sets a cookie that keeps the client's reads on
+    # the primary for PIN_SECONDS, so it sees its own writes despite lag.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def replica_for(self, request):
+        replicas = get_replicas()
+        if not replicas or request.method not in SAFE_METHODS or is_pinned(request):
+            return None
+        return random.choice(replicas)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        replica = self.replica_for(request)
+        if replica is None:
+            return self.pin(request, self.get_response(request), None)
+        with routed(replica) as route:
+            response = self.get_response(request)
+        if response.streaming and not response.is_async:
+            response.streaming_content = stream_from(route, response.streaming_content)
+        return self.pin(request, response, route)
+
+    async def __acall__(self, request):
+        replica = self.replica_for(request)
+        if replica is None:
+            return self.pin(request, await self.get_response(request), None)
+        with routed(replica) as route:
+            response = await self.get_response(request)
+        return self.pin(request, response, route)
+
+    def pin(self, request, response, route):
+        wrote = route.wrote if route is not None else request.method not in SAFE_METHODS
+        if wrote and get_replicas():
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICAS["PIN_SECONDS"],
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
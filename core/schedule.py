@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.db.models import (
+    Count,
+    DateTimeField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+from core.models import Movie, MovieScreening
+
+
+def count_of(queryset, field):
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def end_of_screening():
+    return ExpressionWrapper(
+        F("date") + F("movie__duration") * Value(timedelta(minutes=1)),
+        output_field=DateTimeField(),
+    )
+
+
+def schedule(date_from, date_to, hall=None, genre=None):
+    screenings = MovieScreening.objects.filter(date__gte=date_from, date__lt=date_to)
+    if hall is not None:
+        screenings = screenings.filter(hall_id=hall)
+    if genre is not None:
+        screenings = screenings.filter(
+            Exists(
+                Movie.genres.through.objects.filter(
+                    movie=OuterRef("movie"), genre=genre
+                )
+            )
+        )
+    return screenings.annotate(
+        movie_title=F("movie__title"),
+        movie_duration=F("movie__duration"),
+        end=end_of_screening(),
+        hall_name=F("hall__name"),
+    )
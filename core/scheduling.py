@@ -0,0 +1,174 @@
+from datetime import timedelta
+
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Func
+from django.utils import timezone
+
+from core.exceptions import ScheduleConflict
+from core.models import CinemaHall, Movie, MovieScreening
+from core.utils import chunked
+
+HALL_BOOKED = (
+    "Hall {hall} is booked by screening {screening} until {end:%Y-%m-%d %H:%M}."
+)
+OVERLAPS_ROW = "Overlaps row {row} of this schedule in hall {hall}."
+UNKNOWN = "Does not exist."
+CHUNK_SIZE = 1000
+
+
+class TsTzRange(Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
+def overlapping(hall_id, period, exclude=None):
+    screenings = MovieScreening.objects.filter(hall_id=hall_id, period__overlap=period)
+    if exclude is not None:
+        screenings = screenings.exclude(pk=exclude)
+    return screenings.order_by("date")
+
+
+def booked(screenings):
+    # Probes the exclusion constraint's GiST index once per screening, all in
+    # one query, and returns the first stored screening each one overlaps, by
+    # position. Stored screenings at the same hall and start are the ones the
+    # schedule replaces, so they never count.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "WITH batch AS (SELECT * FROM unnest("
+            "%s::bigint[], %s::timestamptz[], %s::timestamptz[]"
+            ") WITH ORDINALITY AS batch(hall_id, starts, ends, position)) "
+            "SELECT DISTINCT ON (batch.position) batch.position, existing.id, "
+            "upper(existing.period) "
+            f"FROM batch JOIN {MovieScreening._meta.db_table} AS existing "
+            "ON existing.hall_id = batch.hall_id "
+            "AND existing.period && tstzrange(batch.starts, batch.ends) "
+            "WHERE (existing.hall_id, existing.date) "
+            "NOT IN (SELECT hall_id, starts FROM batch) "
+            "ORDER BY batch.position, existing.date",
+            [
+                [screening.hall_id for screening in screenings],
+                [screening.period.lower for screening in screenings],
+                [screening.period.upper for screening in screenings],
+            ],
+        )
+        return {position - 1: (pk, end) for position, pk, end in cursor.fetchall()}
+
+
+def find_conflicts(screenings):
+    # Maps rows of a schedule to unsaved screenings. Sorting by hall and start
+    # finds overlaps within the schedule in one sweep; overlaps with stored
+    # screenings come from a single query.
+    errors = {}
+    latest = None
+    for row in sorted(
+        screenings,
+        key=lambda row: (screenings[row].hall_id, screenings[row].period.lower),
+    ):
+        screening = screenings[row]
+        if latest is not None and screenings[latest].hall_id != screening.hall_id:
+            latest = None
+        if latest is not None:
+            if screening.period.lower < screenings[latest].period.upper:
+                errors[row] = OVERLAPS_ROW.format(row=latest, hall=screening.hall_id)
+            if screening.period.upper <= screenings[latest].period.upper:
+                continue
+        latest = row
+    rows = list(screenings)
+    for position, (pk, end) in booked(list(screenings.values())).items():
+        errors.setdefault(
+            rows[position],
+            HALL_BOOKED.format(
+                hall=screenings[rows[position]].hall_id, screening=pk, end=end
+            ),
+        )
+    return errors
+
+
+def upsert(screenings):
+    return MovieScreening.objects.bulk_create(
+        screenings,
+        update_conflicts=True,
+        unique_fields=["hall", "date"],
+        update_fields=["movie", "period", "seats_total", "updated_at"],
+    )
+
+
+def upsert_chunk(chunk, errors):
+    try:
+        with transaction.atomic():
+            return len(upsert([screening for _, screening in chunk]))
+    except IntegrityError:
+        pass
+    # The schedule changed since it was checked; retry row by row so only the
+    # rows that now conflict are rejected.
+    imported = 0
+    for row, screening in chunk:
+        try:
+            with transaction.atomic():
+                upsert([screening])
+            imported += 1
+        except IntegrityError:
+            errors[row] = {"date": [ScheduleConflict.default_detail]}
+    return imported
+
+
+def import_schedule(items):
+    # Upserts screenings by hall and start from a mapping of rows to
+    # {"movie", "hall", "date"}. Movies and halls are resolved with one query
+    # each and conflicts found in one pass; rows that fail are reported by row
+    # and the rest are written in chunks.
+    durations = dict(
+        Movie.objects.filter(
+            pk__in={item["movie"] for item in items.values()}
+        ).values_list("pk", "duration")
+    )
+    halls = dict(
+        CinemaHall.objects.filter(pk__in={item["hall"] for item in items.values()})
+        .annotate(seats=Count("seat"))
+        .values_list("pk", "seats")
+    )
+    errors = {}
+    screenings = {}
+    for row, item in items.items():
+        unknown = {
+            field: [UNKNOWN]
+            for field, known in (("movie", durations), ("hall", halls))
+            if item[field] not in known
+        }
+        if unknown:
+            errors[row] = unknown
+            continue
+        screenings[row] = MovieScreening(
+            movie_id=item["movie"],
+            hall_id=item["hall"],
+            date=item["date"],
+            period=MovieScreening.period_of(item["date"], durations[item["movie"]]),
+            seats_total=halls[item["hall"]],
+        )
+    if screenings:
+        for row, error in find_conflicts(screenings).items():
+            errors[row] = {"date": [error]}
+            del screenings[row]
+
+    imported = sum(
+        upsert_chunk(chunk, errors) for chunk in chunked(screenings.items(), CHUNK_SIZE)
+    )
+    return {"imported": imported, "errors": errors}
+
+
+def reschedule_movie(movie):
+    # A new duration moves the end of every screening of the movie.
+    try:
+        with transaction.atomic():
+            MovieScreening.objects.filter(movie=movie).update(
+                period=TsTzRange(
+                    F("date"), F("date") + timedelta(minutes=movie.duration)
+                ),
+                updated_at=timezone.now(),
+            )
+    except IntegrityError:
+        raise ScheduleConflict(
+            "The new duration would overlap other screenings in the same hall."
+        )
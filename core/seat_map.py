@@ -0,0 +1,64 @@
+from django.db.models import Exists, OuterRef
+
+from core.holds import get_hold_backend
+from core.metrics import SEAT_MAP_SECONDS
+from core.models import Seat, Ticket
+from core.pricing import quote_seats
+
+GAP = "-"
+FREE = "0"
+SOLD = "1"
+HELD = "2"
+
+
+def seat_states(screening):
+    sold = Ticket.objects.filter(movie_screening_id=screening.pk, seat=OuterRef("pk"))
+    return (
+        Seat.objects.filter(hall_id=screening.hall_id)
+        .annotate(sold=Exists(sold))
+        .order_by("row", "number")
+        .values_list("id", "row", "number", "sold")
+    )
+
+
+def unsold(seats):
+    return [seat_id for seat_id, _, _, is_sold in seats if not is_sold]
+
+
+def render_seat_map(screening, seats, held):
+    rows = sorted({row for _, row, _, _ in seats})
+    width = max((number for _, _, number, _ in seats), default=0)
+    offsets = {row: index * width for index, row in enumerate(rows)}
+    grid = [GAP] * (len(rows) * width)
+    for seat_id, row, number, is_sold in seats:
+        if is_sold:
+            state = SOLD
+        elif seat_id in held:
+            state = HELD
+        else:
+            state = FREE
+        grid[offsets[row] + number - 1] = state
+
+    return {
+        "screening": screening.pk,
+        "hall": screening.hall_id,
+        "rows": rows,
+        "width": width,
+        "seats": "".join(grid),
+        "ids": [seat_id for seat_id, _, _, _ in seats],
+        "prices": quote_seats(screening, seats),
+    }
+
+
+def build_seat_map(screening):
+    with SEAT_MAP_SECONDS.time(mode="sync"):
+        seats = list(seat_states(screening))
+        held = get_hold_backend().held_seats(screening.pk, unsold(seats))
+        return render_seat_map(screening, seats, held)
+
+
+async def abuild_seat_map(screening):
+    with SEAT_MAP_SECONDS.time(mode="async"):
+        seats = [seat async for seat in seat_states(screening)]
+        held = await get_hold_backend().aheld_seats(screening.pk, unsold(seats))
+        return render_seat_map(screening, seats, held)
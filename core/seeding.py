@@ -0,0 +1,158 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import factory
+from django.db import connection, transaction
+from django.utils import timezone as django_timezone
+
+from core.counters import recount
+from core.factories import (
+    ActorFactory,
+    CinemaHallFactory,
+    GenreFactory,
+    MovieFactory,
+    MovieScreeningFactory,
+    bulk_create_batch,
+)
+from core.layouts import create_layout
+from core.models import Movie, MovieScreening, Seat, Ticket
+from core.utils import chunked
+
+SCALES = {
+    "small": {
+        "genres": 10,
+        "actors": 100,
+        "movies": 30,
+        "halls": 3,
+        "rows": 10,
+        "seats_per_row": 20,
+        "screenings": 120,
+        "days": 14,
+        "occupancy": 0.4,
+    },
+    "full": {
+        "genres": 20,
+        "actors": 2000,
+        "movies": 400,
+        "halls": 50,
+        "rows": 20,
+        "seats_per_row": 25,
+        "screenings": 10_000,
+        "days": 90,
+        "occupancy": 0.4,
+    },
+}
+
+START = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+CHUNK_SIZE = 20_000
+
+
+def copy_rows(model, fields, rows, chunk_size=CHUNK_SIZE):
+    # Streams the rows through COPY on Postgres and falls back to chunked
+    # bulk_create elsewhere. Like bulk_create, this skips save() and signals,
+    # so auto_now fields have to be part of ``fields``.
+    fields = [model._meta.get_field(field) for field in fields]
+    copied = 0
+    with connection.cursor() as cursor:
+        if not hasattr(cursor.cursor, "copy"):
+            names = [field.attname for field in fields]
+            for chunk in chunked(rows, chunk_size):
+                model.objects.bulk_create(
+                    model(**dict(zip(names, row))) for row in chunk
+                )
+                copied += len(chunk)
+            return copied
+
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(field.column) for field in fields)
+        table = quote(model._meta.db_table)
+        with cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                copied += 1
+    return copied
+
+
+def link(through, movies, field, targets, per_movie, rng):
+    return copy_rows(
+        through,
+        ["movie", field],
+        (
+            (movie.pk, target.pk)
+            for movie in movies
+            for target in rng.sample(targets, min(per_movie, len(targets)))
+        ),
+    )
+
+
+def plan_screenings(movies, halls, count, days, rng):
+    # Random quarter-hour starts, pushed back where needed so that screenings
+    # in the same hall never overlap.
+    minutes = days * 24 * 60
+    starts = sorted(
+        (rng.randrange(len(halls)), rng.randrange(0, minutes, 15)) for _ in range(count)
+    )
+    free = {}
+    plan = []
+    for hall, start in starts:
+        movie = rng.choice(movies)
+        start = max(start, free.get(hall, 0))
+        start += -start % 15
+        free[hall] = start + movie.duration
+        plan.append((movie, halls[hall], START + timedelta(minutes=start)))
+    return plan
+
+
+@transaction.atomic
+def seed(config, random_seed=0, log=print):
+    rng = random.Random(random_seed)
+
+    genres = bulk_create_batch(GenreFactory, config["genres"])
+    actors = bulk_create_batch(ActorFactory, config["actors"])
+    movies = bulk_create_batch(MovieFactory, config["movies"])
+    link(Movie.genres.through, movies, "genre", genres, 2, rng)
+    link(Movie.actors.through, movies, "actor", actors, 5, rng)
+    log(f"{len(movies)} movies, {len(genres)} genres, {len(actors)} actors")
+
+    halls = bulk_create_batch(CinemaHallFactory, config["halls"])
+    layout = [
+        {"row": row, "seats": config["seats_per_row"], "gaps": set()}
+        for row in range(1, config["rows"] + 1)
+    ]
+    for hall in halls:
+        create_layout(hall, layout)
+    log(f"{len(halls)} halls with {config['rows'] * config['seats_per_row']} seats")
+
+    plan = plan_screenings(movies, halls, config["screenings"], config["days"], rng)
+    screenings = bulk_create_batch(
+        MovieScreeningFactory,
+        len(plan),
+        batch_size=5000,
+        movie=factory.Iterator(movie for movie, _, _ in plan),
+        hall=factory.Iterator(hall for _, hall, _ in plan),
+        date=factory.Iterator(date for _, _, date in plan),
+    )
+    log(f"{len(screenings)} screenings")
+
+    seats_by_hall = {}
+    for seat_id, hall_id in Seat.objects.values_list("id", "hall_id"):
+        seats_by_hall.setdefault(hall_id, []).append(seat_id)
+    now = django_timezone.now()
+    sold = copy_rows(
+        Ticket,
+        ["movie_screening", "seat", "price", "updated_at"],
+        (
+            (screening.pk, seat_id, rng.randint(15, 45), now)
+            for screening in screenings
+            for seat_id in rng.sample(
+                seats_by_hall[screening.hall_id],
+                int(len(seats_by_hall[screening.hall_id]) * config["occupancy"]),
+            )
+        ),
+    )
+    recount(MovieScreening.objects.all())
+    log(f"{sold} tickets")
+
+
+def is_seeded():
+    return MovieScreening.objects.exists()
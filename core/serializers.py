@@ -1,6 +1,20 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework import serializers
 
+from core.booking import hold_seats, move_ticket, purchase_ticket, purchase_tickets
+from core.exceptions import ScheduleConflict
+from core.layouts import create_layout
 from core.models import Actor, CinemaHall, Genre, Movie, MovieScreening, Seat, Ticket
+from core.reports import GROUPS
+from core.scheduling import (
+    HALL_BOOKED,
+    import_schedule,
+    overlapping,
+    reschedule_movie,
+)
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -16,10 +30,25 @@ class ActorSerializer(serializers.ModelSerializer):
 
 
 class MovieSerializer(serializers.ModelSerializer):
+    expandable_fields = {"genres": GenreSerializer, "actors": ActorSerializer}
+
     class Meta:
         model = Movie
         fields = "__all__"
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in self.context.get("expand", ()):
+            self.fields[name] = self.expandable_fields[name](many=True, read_only=True)
+
+    def update(self, instance, validated_data):
+        duration = instance.duration
+        with transaction.atomic():
+            movie = super().update(instance, validated_data)
+            if movie.duration != duration:
+                reschedule_movie(movie)
+        return movie
+
 
 class CinemaHallSerializer(serializers.ModelSerializer):
     class Meta:
@@ -36,10 +65,297 @@ class SeatSerializer(serializers.ModelSerializer):
 class MovieScreeningSerializer(serializers.ModelSerializer):
     class Meta:
         model = MovieScreening
-        fields = "__all__"
+        exclude = ["period"]
+        read_only_fields = ["seats_total", "seats_sold"]
+
+    def validate(self, attrs):
+        def current(field):
+            return attrs.get(field, getattr(self.instance, field, None))
+
+        period = MovieScreening.period_of(current("date"), current("movie").duration)
+        screening = overlapping(
+            current("hall").pk, period, getattr(self.instance, "pk", None)
+        ).first()
+        if screening is not None:
+            raise serializers.ValidationError(
+                {
+                    "date": HALL_BOOKED.format(
+                        hall=screening.hall_id,
+                        screening=screening.pk,
+                        end=screening.period.upper,
+                    )
+                }
+            )
+        return attrs
+
+    def save(self, **kwargs):
+        # The exclusion constraint settles races between the check and the write.
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            raise ScheduleConflict()
+
+
+class ScheduleQuerySerializer(serializers.Serializer):
+    max_range = timedelta(days=31)
+
+    def get_fields(self):
+        # "from" is a keyword, so the fields cannot be declared as attributes.
+        return {
+            "from": serializers.DateTimeField(source="date_from", required=False),
+            "to": serializers.DateTimeField(source="date_to", required=False),
+            "hall": serializers.IntegerField(required=False),
+            "genre": serializers.IntegerField(required=False),
+        }
+
+    def validate(self, attrs):
+        attrs.setdefault("date_from", timezone.now())
+        attrs.setdefault("date_to", attrs["date_from"] + timedelta(days=7))
+        if (
+            not attrs["date_from"]
+            < attrs["date_to"]
+            <= attrs["date_from"] + self.max_range
+        ):
+            raise serializers.ValidationError(
+                {
+                    "to": "Must be after from and at most "
+                    f"{self.max_range.days} days later."
+                }
+            )
+        return attrs
+
+
+class ReportQuerySerializer(ScheduleQuerySerializer):
+    # Reports look back from now by default.
+    max_range = timedelta(days=366)
+    default_range = timedelta(days=30)
+
+    def validate(self, attrs):
+        if "date_from" not in attrs:
+            attrs.setdefault("date_to", timezone.now())
+            attrs["date_from"] = attrs["date_to"] - self.default_range
+        return super().validate(attrs)
+
+
+class RevenueQuerySerializer(ReportQuerySerializer):
+    def get_fields(self):
+        return {
+            **super().get_fields(),
+            "group": serializers.CharField(required=False, default="movie"),
+        }
+
+    def validate_group(self, value):
+        group = [key for key in value.split(",") if key]
+        if not group or len(set(group)) != len(group) or set(group) - set(GROUPS):
+            raise serializers.ValidationError(
+                f"Comma-separated list of {', '.join(GROUPS)}."
+            )
+        return group
+
+
+class ScheduleSerializer(serializers.ModelSerializer):
+    movie_title = serializers.CharField()
+    movie_duration = serializers.IntegerField()
+    end = serializers.DateTimeField()
+    hall_name = serializers.CharField()
+    seats_total = serializers.IntegerField()
+    seats_sold = serializers.IntegerField()
+    seats_free = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MovieScreening
+        fields = [
+            "id",
+            "date",
+            "end",
+            "movie",
+            "movie_title",
+            "movie_duration",
+            "hall",
+            "hall_name",
+            "seats_total",
+            "seats_sold",
+            "seats_free",
+        ]
+
+    def get_seats_free(self, obj) -> int:
+        return obj.seats_total - obj.seats_sold
+
+
+class OccupancySerializer(ScheduleSerializer):
+    revenue = serializers.IntegerField()
+    occupancy = serializers.FloatField(help_text="Percent of seats sold")
+
+    class Meta(ScheduleSerializer.Meta):
+        fields = ScheduleSerializer.Meta.fields + ["revenue", "occupancy"]
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    hold = serializers.CharField(write_only=True, required=False)
+
     class Meta:
         model = Ticket
         fields = "__all__"
+        # Prices are quoted by the server when the ticket is bought.
+        read_only_fields = ["price"]
+        # Seat uniqueness is enforced by the database and reported as 409.
+        validators = []
+
+    def validate(self, attrs):
+        screening = attrs.get(
+            "movie_screening", getattr(self.instance, "movie_screening", None)
+        )
+        seat = attrs.get("seat", getattr(self.instance, "seat", None))
+        if seat is not None and seat.hall_id != screening.hall_id:
+            raise serializers.ValidationError(
+                {"seat": "Seat does not belong to the screening's hall."}
+            )
+        return attrs
+
+    def create(self, validated_data):
+        return purchase_ticket(
+            validated_data["movie_screening"],
+            validated_data.get("seat"),
+            validated_data.get("hold"),
+        )
+
+    def update(self, instance, validated_data):
+        return move_ticket(
+            instance,
+            validated_data.get("movie_screening", instance.movie_screening),
+            validated_data.get("seat", instance.seat),
+            validated_data.get("hold"),
+        )
+
+
+class SeatMapSerializer(serializers.Serializer):
+    screening = serializers.IntegerField()
+    hall = serializers.IntegerField()
+    rows = serializers.ListField(child=serializers.IntegerField())
+    width = serializers.IntegerField()
+    seats = serializers.CharField(
+        help_text="Row-major seat states: '-' no seat, '0' free, '1' sold, '2' held"
+    )
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="Seat ids in row-major order, skipping gaps",
+    )
+    prices = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="Current seat prices in PLN, in the same order as ids",
+    )
+
+
+class TicketBatchItemSerializer(serializers.Serializer):
+    seat = serializers.IntegerField()
+
+
+class TicketBatchSerializer(serializers.Serializer):
+    movie_screening = serializers.PrimaryKeyRelatedField(
+        queryset=MovieScreening.objects.only("id", "hall_id", "date", "seats_sold")
+    )
+    tickets = TicketBatchItemSerializer(many=True, allow_empty=False, max_length=100)
+    hold = serializers.CharField(write_only=True, required=False)
+
+    def validate_tickets(self, value):
+        seats = [item["seat"] for item in value]
+        if len(seats) != len(set(seats)):
+            raise serializers.ValidationError("Each seat may only be bought once.")
+        return value
+
+    def create(self, validated_data):
+        return purchase_tickets(
+            validated_data["movie_screening"],
+            [item["seat"] for item in validated_data["tickets"]],
+            validated_data.get("hold"),
+        )
+
+
+class ScheduleImportItemSerializer(serializers.Serializer):
+    movie = serializers.IntegerField()
+    hall = serializers.IntegerField()
+    date = serializers.DateTimeField()
+
+
+class ScheduleImportSerializer(serializers.Serializer):
+    max_rows = 10_000
+
+    screenings = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=max_rows
+    )
+
+    def validate_screenings(self, value):
+        # Invalid rows are reported with the result instead of failing the import.
+        rows, self.row_errors = {}, {}
+        for row, data in enumerate(value):
+            item = ScheduleImportItemSerializer(data=data)
+            if item.is_valid():
+                rows[row] = item.validated_data
+            else:
+                self.row_errors[row] = item.errors
+        return rows
+
+    def create(self, validated_data):
+        result = import_schedule(validated_data["screenings"])
+        errors = {**self.row_errors, **result["errors"]}
+        return {"imported": result["imported"], "errors": dict(sorted(errors.items()))}
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    token = serializers.CharField(read_only=True)
+    seats = serializers.ListField(
+        child=serializers.IntegerField(), source="seat_ids", allow_empty=False
+    )
+    expires_at = serializers.DateTimeField(read_only=True)
+
+    def create(self, validated_data):
+        return hold_seats(validated_data["movie_screening"], validated_data["seat_ids"])
+
+
+class HallLayoutRowSerializer(serializers.Serializer):
+    max_seats = 500
+
+    row = serializers.IntegerField(min_value=1, max_value=32767)
+    seats = serializers.IntegerField(min_value=1, max_value=max_seats)
+    gaps = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=max_seats,
+    )
+
+    def validate(self, attrs):
+        if any(gap > attrs["seats"] for gap in attrs["gaps"]):
+            raise serializers.ValidationError(
+                {"gaps": "Gaps must be seat numbers within the row."}
+            )
+        attrs["gaps"] = set(attrs["gaps"])
+        return attrs
+
+
+class HallLayoutSerializer(serializers.Serializer):
+    max_rows = 200
+    max_seats = 10_000
+
+    rows = HallLayoutRowSerializer(
+        many=True, allow_empty=False, max_length=max_rows, write_only=True
+    )
+    replace = serializers.BooleanField(default=False, write_only=True)
+    created = serializers.IntegerField(read_only=True)
+    deleted = serializers.IntegerField(read_only=True)
+
+    def validate_rows(self, value):
+        numbers = [spec["row"] for spec in value]
+        if len(numbers) != len(set(numbers)):
+            raise serializers.ValidationError("Each row may only be listed once.")
+        if sum(spec["seats"] - len(spec["gaps"]) for spec in value) > self.max_seats:
+            raise serializers.ValidationError(
+                f"A hall may have at most {self.max_seats} seats."
+            )
+        return value
+
+    def create(self, validated_data):
+        return create_layout(
+            validated_data["hall"], validated_data["rows"], validated_data["replace"]
+        )
@@ -0,0 +1,96 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.utils import timezone
+
+from core.cache import bump_version
+from core.counters import add_sold
+from core.events import FREE, SOLD, publish_seats
+from core.metrics import observe_query
+from core.models import Actor, CinemaHall, Genre, Movie, MovieScreening, Ticket
+
+CATALOG_MODELS = (Genre, Actor, Movie, CinemaHall)
+
+
+def invalidate_catalog(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(sender))
+
+
+def touch_movies(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        movies = Movie.objects.filter(pk=instance.pk)
+    elif pk_set is not None:
+        movies = Movie.objects.filter(pk__in=pk_set)
+    else:
+        movies = instance.movies.all()
+    movies.update(updated_at=timezone.now())
+
+
+def touch_related_movies(sender, instance, **kwargs):
+    # The join rows go with a deleted genre or actor without m2m_changed.
+    instance.movies.update(updated_at=timezone.now())
+
+
+def invalidate_movie_relations(sender, action, **kwargs):
+    if action.startswith("post_"):
+        transaction.on_commit(lambda: bump_version(Movie))
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog, sender=model)
+    post_delete.connect(invalidate_catalog, sender=model)
+
+for through in (Movie.genres.through, Movie.actors.through):
+    m2m_changed.connect(touch_movies, sender=through)
+    m2m_changed.connect(invalidate_movie_relations, sender=through)
+
+for model in (Genre, Actor):
+    pre_delete.connect(touch_related_movies, sender=model)
+
+
+def publish_ticket_sold(sender, instance, created, **kwargs):
+    if created:
+        publish_seats(instance.movie_screening_id, [instance.seat_id], SOLD)
+
+
+def deleted_with_screening(origin):
+    # Tickets cascading from a deleted screening need no counts or events.
+    model = getattr(origin, "model", type(origin))
+    return issubclass(model, MovieScreening)
+
+
+def publish_ticket_released(sender, instance, origin=None, **kwargs):
+    if deleted_with_screening(origin):
+        return
+    publish_seats(instance.movie_screening_id, [instance.seat_id], FREE)
+
+
+def count_ticket_sold(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.seat_id is not None:
+        add_sold(instance.movie_screening_id, 1)
+
+
+def touch_screening(sender, instance, origin=None, **kwargs):
+    # A deleted ticket leaves no updated_at behind, so the screening carries it
+    # for the incremental sales summary refresh, along with its seat count.
+    if deleted_with_screening(origin):
+        return
+    add_sold(instance.movie_screening_id, -(instance.seat_id is not None))
+
+
+post_save.connect(publish_ticket_sold, sender=Ticket)
+post_save.connect(count_ticket_sold, sender=Ticket)
+post_delete.connect(publish_ticket_released, sender=Ticket)
+post_delete.connect(touch_screening, sender=Ticket)
+
+
+def instrument_connection(sender, connection, **kwargs):
+    # First in line, so the per-request wrappers that push and pop around it
+    # never remove it.
+    if observe_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, observe_query)
+
+
+connection_created.connect(instrument_connection)
@@ -0,0 +1,15 @@
+import pytest
+from django.core.cache import caches
+from rest_framework.test import APIClient
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from core.tests.factories import (
+    MovieFactory,
+    MovieScreeningFactory,
+    SeatFactory,
+    TicketFactory,
+)
+
+START = datetime(2026, 3, 2, 10, tzinfo=timezone.utc)
+
+
+def async_get(url, params=None):
+    return async_to_sync(AsyncClient().get)(url, params or {})
+
+
+@pytest.mark.django_db
+def test_async_movie_detail_matches_sync(api_client):
+    movie = MovieFactory()
+    url_kwargs = {"pk": movie.pk}
+
+    for params in [{}, {"expand": "genres,actors"}]:
+        expected = api_client.get(reverse("movie-detail", kwargs=url_kwargs), params)
+        response = async_get(reverse("async-movie-detail", kwargs=url_kwargs), params)
+
+        assert response.status_code == 200
+        assert response.json() == expected.json()
+
+
+@pytest.mark.django_db
+def test_async_seat_map_matches_sync(api_client):
+    screening = MovieScreeningFactory()
+    seats = [SeatFactory(hall=screening.hall, row=1, number=n) for n in (1, 2, 4)]
+    TicketFactory(movie_screening=screening, seat=seats[1])
+    url_kwargs = {"pk": screening.pk}
+
+    expected = api_client.get(reverse("screening-seat-map", kwargs=url_kwargs))
+    response = async_get(reverse("async-screening-seat-map", kwargs=url_kwargs))
+
+    assert response.json() == expected.json()
+    assert response.json()["seats"] == "01-0"
+
+
+@pytest.mark.django_db
+def test_async_schedule_pages_by_keyset():
+    screenings = [
+        MovieScreeningFactory(date=START + timedelta(hours=hours))
+        for hours in [3, 1, 2, 2, 4]
+    ]
+    expected = sorted(screenings, key=lambda screening: (screening.date, screening.pk))
+
+    seen = []
+    response = async_get(
+        reverse("async-schedule"), {"from": START.isoformat(), "page_size": 2}
+    )
+    while True:
+        seen += [screening["id"] for screening in response.json()["results"]]
+        if response.json()["next"] is None:
+            break
+        response = async_get(response.json()["next"])
+
+    assert seen == [screening.pk for screening in expected]
+
+
+@pytest.mark.django_db
+def test_async_views_return_errors():
+    missing = async_get(reverse("async-movie-detail", kwargs={"pk": 1}))
+    invalid = async_get(reverse("async-schedule"), {"from": "yesterday"})
+    bad_cursor = async_get(reverse("async-schedule"), {"cursor": "nope"})
+
+    assert missing.status_code == 404
+    assert invalid.status_code == 400
+    assert bad_cursor.status_code == 404
@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from core.booking import hold_seats, purchase_ticket
+from core.exceptions import SeatTaken
+from core.models import Ticket
+from core.pricing import quote_seat
+from core.tests.factories import MovieScreeningFactory, SeatFactory, TicketFactory
+
+
+@pytest.mark.django_db
+def test_buying_taken_seat_conflicts(api_client):
+    screening = MovieScreeningFactory()
+    seat = SeatFactory(hall=screening.hall)
+    payload = {"movie_screening": screening.pk, "seat": seat.pk}
+
+    first = api_client.post(reverse("ticket-list"), payload)
+    second = api_client.post(reverse("ticket-list"), payload)
+
+    assert first.status_code == 201
+    assert second.status_code == 409
+    assert Ticket.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_ticket_without_a_seat(api_client):
+    screening = MovieScreeningFactory()
+
+    response = api_client.post(
+        reverse("ticket-list"), {"movie_screening": screening.pk}
+    )
+
+    assert response.status_code == 201
+    assert response.data["seat"] is None
+    assert response.data["price"] > 0
+
+
+@pytest.mark.django_db
+def test_moving_ticket_to_taken_seat_conflicts(api_client):
+    screening = MovieScreeningFactory()
+    taken = TicketFactory(movie_screening=screening, seat__hall=screening.hall)
+    ticket = TicketFactory(movie_screening=screening, seat__hall=screening.hall)
+
+    response = api_client.patch(
+        reverse("ticket-detail", kwargs={"pk": ticket.pk}), {"seat": taken.seat_id}
+    )
+
+    assert response.status_code == 409
+
+
+@pytest.mark.django_db
+def test_moving_ticket_to_held_seat_needs_the_hold(api_client):
+    screening = MovieScreeningFactory()
+    ticket = TicketFactory(
+        movie_screening=screening, seat__hall=screening.hall, price=1
+    )
+    seat = SeatFactory(hall=screening.hall)
+    hold = hold_seats(screening, [seat.pk])
+    url = reverse("ticket-detail", kwargs={"pk": ticket.pk})
+
+    held = api_client.patch(url, {"seat": seat.pk})
+    moved = api_client.patch(url, {"seat": seat.pk, "hold": hold.token})
+
+    assert held.status_code == 409
+    assert moved.status_code == 200
+    assert moved.data["price"] == quote_seat(screening, seat) != 1
+
+
+@pytest.mark.django_db
+def test_buying_seat_from_another_hall_is_rejected(api_client):
+    screening = MovieScreeningFactory()
+    seat = SeatFactory()
+
+    response = api_client.post(
+        reverse("ticket-list"),
+        {"movie_screening": screening.pk, "seat": seat.pk},
+    )
+
+    assert response.status_code == 400
+    assert "seat" in response.data
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_buyers_never_double_book():
+    screening = MovieScreeningFactory()
+    seats = [SeatFactory(hall=screening.hall, row=1, number=n) for n in range(1, 9)]
+    buyers = 200
+
+    def buy(index):
+        try:
+            purchase_ticket(screening, seats[index % len(seats)])
+            return True
+        except SeatTaken:
+            return False
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(buy, range(buyers)))
+
+    assert results.count(True) == len(seats)
+    assert sorted(Ticket.objects.values_list("seat_id", flat=True)) == sorted(
+        seat.pk for seat in seats
+    )
+
+
+@pytest.fixture
+def group_booking():
+    screening = MovieScreeningFactory()
+    seats = [SeatFactory(hall=screening.hall, row=1, number=n) for n in range(1, 7)]
+    payload = {
+        "movie_screening": screening.pk,
+        "tickets": [{"seat": seat.pk} for seat in seats],
+    }
+    return screening, seats, payload
+
+
+@pytest.mark.django_db
+def test_batch_purchase_in_constant_queries(
+    api_client, group_booking, django_assert_max_num_queries
+):
+    screening, seats, payload = group_booking
+
+    with django_assert_max_num_queries(9):
+        response = api_client.post(reverse("ticket-batch"), payload, format="json")
+
+    assert response.status_code == 201
+    assert sorted(ticket["seat"] for ticket in response.data) == sorted(
+        seat.pk for seat in seats
+    )
+    assert Ticket.objects.filter(movie_screening=screening).count() == 6
+
+
+@pytest.mark.django_db
+def test_batch_purchase_is_all_or_nothing(api_client, group_booking):
+    screening, seats, payload = group_booking
+    TicketFactory(movie_screening=screening, seat=seats[2])
+    TicketFactory(movie_screening=screening, seat=seats[4])
+
+    response = api_client.post(reverse("ticket-batch"), payload, format="json")
+
+    assert response.status_code == 409
+    assert set(response.json()["seats"]) == {str(seats[2].pk), str(seats[4].pk)}
+    assert Ticket.objects.filter(movie_screening=screening).count() == 2
+
+
+@pytest.mark.django_db
+def test_batch_purchase_reports_foreign_and_held_seats(api_client, group_booking):
+    screening, seats, payload = group_booking
+    foreign = SeatFactory()
+    api_client.post(
+        reverse("screening-hold", kwargs={"pk": screening.pk}),
+        {"seats": [seats[0].pk]},
+        format="json",
+    )
+
+    invalid = api_client.post(
+        reverse("ticket-batch"),
+        {**payload, "tickets": [*payload["tickets"], {"seat": foreign.pk}]},
+        format="json",
+    )
+    held = api_client.post(reverse("ticket-batch"), payload, format="json")
+
+    assert invalid.status_code == 400
+    assert list(invalid.json()["seats"]) == [str(foreign.pk)]
+    assert held.status_code == 409
+    assert list(held.json()["seats"]) == [str(seats[0].pk)]
+    assert not Ticket.objects.exists()
+
+
+@pytest.mark.django_db
+def test_batch_purchase_rejects_duplicate_seats(api_client, group_booking):
+    _, seats, payload = group_booking
+    ticket = {"seat": seats[0].pk}
+
+    response = api_client.post(
+        reverse("ticket-batch"), {**payload, "tickets": [ticket, ticket]}, format="json"
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,100 @@
+import pytest
+from django.urls import reverse
+
+from core.cache import reset_cache_stats
+from core.tests.factories import ActorFactory, GenreFactory, MovieFactory
+
+
+@pytest.fixture(autouse=True)
+def stats():
+    reset_cache_stats()
+
+
+@pytest.mark.django_db
+def test_catalog_reads_are_cached(api_client, django_assert_num_queries):
+    GenreFactory.create_batch(2)
+    api_client.get(reverse("genre-list"))
+
+    with django_assert_num_queries(0):
+        response = api_client.get(reverse("genre-list"))
+
+    assert response["X-Cache"] == "HIT"
+    assert len(response.data["results"]) == 2
+    assert api_client.get(reverse("cache-stats")).data["GenreViewSet"] == {
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": 0.5,
+    }
+
+
+@pytest.mark.django_db
+def test_cache_hits_revalidate_without_queries(api_client, django_assert_num_queries):
+    GenreFactory()
+    etag = api_client.get(reverse("genre-list"))["ETag"]
+
+    with django_assert_num_queries(0):
+        response = api_client.get(reverse("genre-list"), HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert response["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_query_params_are_part_of_the_key(api_client):
+    GenreFactory.create_batch(3)
+    api_client.get(reverse("genre-list"), {"page_size": 1})
+
+    response = api_client.get(reverse("genre-list"), {"page_size": 2})
+
+    assert response["X-Cache"] == "MISS"
+    assert len(response.data["results"]) == 2
+
+
+@pytest.mark.django_db
+def test_writes_invalidate_cached_reads(api_client, django_capture_on_commit_callbacks):
+    genre = GenreFactory(name="drama")
+    url = reverse("genre-detail", kwargs={"pk": genre.pk})
+    api_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.patch(url, {"name": "comedy"})
+    response = api_client.get(url)
+
+    assert response["X-Cache"] == "MISS"
+    assert response.data["name"] == "comedy"
+
+
+@pytest.mark.django_db
+def test_related_changes_invalidate_movies(
+    api_client, django_capture_on_commit_callbacks
+):
+    genre = GenreFactory(name="drama")
+    movie = MovieFactory(genres=[genre])
+    url = reverse("movie-detail", kwargs={"pk": movie.pk})
+    api_client.get(url, {"expand": "genres"})
+
+    with django_capture_on_commit_callbacks(execute=True):
+        genre.name = "noir"
+        genre.save()
+    renamed = api_client.get(url, {"expand": "genres"})
+    with django_capture_on_commit_callbacks(execute=True):
+        movie.actors.add(ActorFactory())
+    cast_changed = api_client.get(url, {"expand": "genres"})
+
+    assert renamed["X-Cache"] == "MISS"
+    assert renamed.data["genres"][0]["name"] == "noir"
+    assert cast_changed["X-Cache"] == "MISS"
+    assert len(cast_changed.data["actors"]) == 2
+
+
+@pytest.mark.django_db
+def test_unrelated_writes_keep_cache(api_client, django_capture_on_commit_callbacks):
+    GenreFactory()
+    api_client.get(reverse("genre-list"))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ActorFactory()
+    response = api_client.get(reverse("genre-list"))
+
+    assert response["X-Cache"] == "HIT"
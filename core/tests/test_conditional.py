@@ -0,0 +1,98 @@
+import pytest
+from django.urls import reverse
+
+from core.tests.factories import (
+    ActorFactory,
+    GenreFactory,
+    MovieFactory,
+    SeatFactory,
+)
+
+
+@pytest.mark.django_db
+def test_unchanged_list_is_not_modified(api_client, django_assert_num_queries):
+    SeatFactory.create_batch(3)
+    etag = api_client.get(reverse("seat-list"))["ETag"]
+
+    with django_assert_num_queries(1):
+        response = api_client.get(reverse("seat-list"), HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+
+@pytest.mark.django_db
+def test_list_etag_changes_on_create_and_delete(api_client):
+    seats = SeatFactory.create_batch(2)
+    first = api_client.get(reverse("seat-list"))["ETag"]
+
+    SeatFactory()
+    second = api_client.get(reverse("seat-list"))["ETag"]
+    seats[0].delete()
+    third = api_client.get(reverse("seat-list"))["ETag"]
+
+    assert len({first, second, third}) == 3
+    assert (
+        api_client.get(reverse("seat-list"), HTTP_IF_NONE_MATCH=first).status_code
+        == 200
+    )
+
+
+@pytest.mark.django_db
+def test_list_etag_depends_on_query(api_client):
+    SeatFactory.create_batch(2)
+
+    full = api_client.get(reverse("seat-list"))
+    page = api_client.get(reverse("seat-list"), {"page_size": 1})
+
+    assert full["ETag"] != page["ETag"]
+
+
+@pytest.mark.django_db
+def test_detail_supports_last_modified(api_client):
+    seat = SeatFactory()
+    url = reverse("seat-detail", kwargs={"pk": seat.pk})
+    last_modified = api_client.get(url)["Last-Modified"]
+
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_detail_of_missing_object_is_not_found(api_client):
+    response = api_client.get(reverse("seat-detail", kwargs={"pk": 1}))
+
+    assert response.status_code == 404
+    assert "ETag" not in response
+
+
+@pytest.mark.django_db
+def test_movie_etag_changes_with_cast(api_client, django_capture_on_commit_callbacks):
+    movie = MovieFactory()
+    url = reverse("movie-detail", kwargs={"pk": movie.pk})
+    etag = api_client.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ActorFactory().movies.add(movie)
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert len(response.data["actors"]) == 2
+
+
+@pytest.mark.django_db
+def test_movie_list_etag_changes_when_a_genre_is_deleted(
+    api_client, django_capture_on_commit_callbacks
+):
+    genre = GenreFactory()
+    MovieFactory(genres=[genre])
+    url = reverse("movie-list")
+    etag = api_client.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        genre.delete()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response.data["results"][0]["genres"] == []
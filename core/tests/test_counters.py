@@ -0,0 +1,148 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from core.counters import reconcile_counters
+from core.models import MovieScreening
+from core.tests.factories import (
+    CinemaHallFactory,
+    MovieScreeningFactory,
+    SeatFactory,
+    TicketFactory,
+)
+
+
+@pytest.fixture
+def screening():
+    hall = CinemaHallFactory()
+    SeatFactory.create_batch(4, hall=hall)
+    return MovieScreeningFactory(hall=hall)
+
+
+def counters(screening):
+    screening.refresh_from_db(fields=["seats_total", "seats_sold"])
+    return screening.seats_total, screening.seats_sold
+
+
+@pytest.mark.django_db
+def test_purchases_and_refunds_move_the_counters(api_client, screening):
+    first, second, third, fourth = screening.hall.seat.order_by("pk")
+
+    api_client.post(
+        reverse("ticket-list"), {"movie_screening": screening.pk, "seat": first.pk}
+    )
+    api_client.post(
+        reverse("ticket-list"),
+        {"movie_screening": screening.pk, "seat": None},
+        format="json",
+    )
+    api_client.post(
+        reverse("ticket-batch"),
+        {
+            "movie_screening": screening.pk,
+            "tickets": [{"seat": second.pk}, {"seat": third.pk}],
+        },
+        format="json",
+    )
+    assert counters(screening) == (4, 3)
+
+    ticket = screening.ticket.get(seat=first)
+    api_client.delete(reverse("ticket-detail", kwargs={"pk": ticket.pk}))
+    assert counters(screening) == (4, 2)
+
+
+@pytest.mark.django_db
+def test_moving_a_ticket_moves_its_seat_count(api_client, screening):
+    other = MovieScreeningFactory(hall=screening.hall)
+    ticket = TicketFactory(movie_screening=screening, seat=screening.hall.seat.first())
+    url = reverse("ticket-detail", kwargs={"pk": ticket.pk})
+
+    api_client.patch(url, {"movie_screening": other.pk})
+    assert counters(screening) == (4, 0)
+    assert counters(other) == (4, 1)
+
+    api_client.patch(url, {"seat": ""})
+    assert counters(other) == (4, 0)
+
+
+@pytest.mark.django_db
+def test_seat_changes_recount_the_hall(api_client, screening):
+    seat = screening.hall.seat.first()
+    TicketFactory(movie_screening=screening, seat=seat)
+    other = MovieScreeningFactory()
+
+    api_client.post(
+        reverse("seat-list"), {"row": 9, "number": 1, "hall": screening.hall_id}
+    )
+    assert counters(screening) == (5, 1)
+
+    api_client.patch(
+        reverse("seat-detail", kwargs={"pk": screening.hall.seat.last().pk}),
+        {"hall": other.hall_id},
+    )
+    assert counters(screening) == (4, 1)
+    assert counters(other) == (1, 0)
+
+    api_client.delete(reverse("seat-detail", kwargs={"pk": seat.pk}))
+    assert counters(screening) == (3, 0)
+
+
+@pytest.mark.django_db
+def test_listing_reads_the_counters(api_client, screening, django_assert_num_queries):
+    MovieScreening.objects.filter(pk=screening.pk).update(seats_sold=3)
+
+    with django_assert_num_queries(2):
+        response = api_client.get(
+            reverse("schedule"), {"from": screening.date.isoformat()}
+        )
+
+    assert response.data["results"][0]["seats_free"] == 1
+
+
+@pytest.mark.django_db
+def test_reconcile_repairs_drift(screening):
+    TicketFactory(movie_screening=screening, seat=screening.hall.seat.first())
+    MovieScreeningFactory()
+    MovieScreening.objects.filter(pk=screening.pk).update(seats_total=0, seats_sold=7)
+    stdout, stderr = StringIO(), StringIO()
+
+    call_command("reconcile_seat_counters", "--dry-run", stdout=stdout)
+    assert stdout.getvalue() == "Found 1 drifted screenings\n"
+    assert counters(screening) == (0, 7)
+
+    call_command("reconcile_seat_counters", stdout=stdout, stderr=stderr)
+    assert stderr.getvalue() == f"Screening {screening.pk} drifted\n"
+    assert counters(screening) == (4, 1)
+    assert reconcile_counters() == []
+
+
+@pytest.mark.django_db
+def test_sales_change_the_screening_etag(api_client, screening):
+    urls = [
+        reverse("screening-detail", kwargs={"pk": screening.pk}),
+        reverse("screening-list"),
+    ]
+    etags = [api_client.get(url)["ETag"] for url in urls]
+
+    api_client.post(
+        reverse("ticket-list"),
+        {"movie_screening": screening.pk, "seat": screening.hall.seat.first().pk},
+    )
+
+    for url, etag in zip(urls, etags):
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+    assert response.data["results"][0]["seats_sold"] == 1
+
+
+@pytest.mark.django_db
+def test_deleting_a_screening_skips_its_tickets_counts(
+    screening, django_assert_num_queries
+):
+    for seat in screening.hall.seat.all():
+        TicketFactory(movie_screening=screening, seat=seat)
+
+    with django_assert_num_queries(5):
+        screening.delete()
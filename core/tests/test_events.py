@@ -0,0 +1,138 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+
+from core.booking import hold_seats, purchase_tickets
+from core.events import get_broker
+from core.serializers import TicketSerializer
+from core.tests.factories import MovieScreeningFactory, SeatFactory, TicketFactory
+
+
+@pytest.fixture
+def screening():
+    return MovieScreeningFactory()
+
+
+@pytest.fixture
+def seats(screening):
+    return SeatFactory.create_batch(3, hall=screening.hall)
+
+
+def committed(action):
+    def run(*args, **kwargs):
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            return action(*args, **kwargs)
+
+    return sync_to_async(run)
+
+
+def receive(screening, action, *args, count=1, **kwargs):
+    async def listen():
+        events = get_broker().subscribe(screening.pk)
+        pending = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0)
+        await committed(action)(*args, **kwargs)
+        received = [await asyncio.wait_for(pending, 1)]
+        for _ in range(count - 1):
+            received.append(await asyncio.wait_for(anext(events), 1))
+        await events.aclose()
+        return received
+
+    return async_to_sync(listen)()
+
+
+@pytest.mark.django_db
+def test_sold_ticket_is_pushed(screening, seats):
+    events = receive(screening, TicketFactory, movie_screening=screening, seat=seats[0])
+
+    assert events == [{"seats": [seats[0].pk], "state": "sold"}]
+
+
+@pytest.mark.django_db
+def test_deleted_ticket_frees_seat(screening, seats):
+    ticket = TicketFactory(movie_screening=screening, seat=seats[1])
+
+    events = receive(screening, ticket.delete)
+
+    assert events == [{"seats": [seats[1].pk], "state": "free"}]
+
+
+@pytest.mark.django_db
+def test_moved_ticket_frees_seat_of_old_screening(screening, seats):
+    ticket = TicketFactory(movie_screening=screening, seat=seats[0])
+    later = MovieScreeningFactory(
+        hall=screening.hall, date=screening.date + timedelta(days=1)
+    )
+
+    def move():
+        serializer = TicketSerializer(
+            ticket, data={"movie_screening": later.pk}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    events = receive(screening, move)
+
+    assert events == [{"seats": [seats[0].pk], "state": "free"}]
+
+
+@pytest.mark.django_db
+def test_hold_and_batch_purchase_are_pushed(screening, seats):
+    def hold_then_buy():
+        hold = hold_seats(screening, [seats[0].pk, seats[1].pk])
+        purchase_tickets(screening, [seats[0].pk, seats[1].pk], hold.token)
+        return hold
+
+    held, sold = receive(screening, hold_then_buy, count=2)
+
+    assert held["state"] == "held"
+    assert held["seats"] == [seats[0].pk, seats[1].pk]
+    assert "expires_at" in held
+    assert sold == {"seats": [seats[0].pk, seats[1].pk], "state": "sold"}
+
+
+@pytest.mark.django_db
+def test_event_stream_speaks_sse(screening, seats):
+    async def stream():
+        response = await AsyncClient().get(
+            reverse("screening-events", kwargs={"pk": screening.pk})
+        )
+        chunks = aiter(response.streaming_content)
+        first = await anext(chunks)
+        pending = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0)
+        await committed(TicketFactory)(movie_screening=screening, seat=seats[2])
+        second = await asyncio.wait_for(pending, 1)
+        await response.streaming_content.aclose()
+        return response, first, second
+
+    response, first, second = async_to_sync(stream)()
+
+    assert response["Content-Type"] == "text/event-stream"
+    assert first == b"retry: 3000\n\n"
+    assert second.startswith(b"data: ")
+    assert json.loads(second[len("data: ") :]) == {
+        "seats": [seats[2].pk],
+        "state": "sold",
+    }
+
+
+@pytest.mark.django_db
+def test_event_stream_of_missing_screening():
+    response = async_to_sync(AsyncClient().get)(
+        reverse("screening-events", kwargs={"pk": 1})
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_event_stream_is_not_served_under_wsgi(api_client, screening):
+    response = api_client.get(reverse("screening-events", kwargs={"pk": screening.pk}))
+
+    assert response.status_code == 501
@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from core import exports
+from core.tests.factories import (
+    CinemaHallFactory,
+    MovieFactory,
+    MovieScreeningFactory,
+    SeatFactory,
+    TicketFactory,
+)
+
+START = datetime(2026, 3, 2, 10, tzinfo=timezone.utc)
+RANGE = {"from": "2026-03-01T00:00:00Z", "to": "2026-04-01T00:00:00Z"}
+
+
+@pytest.fixture
+def tickets():
+    movie = MovieFactory(title="Heat")
+    red, blue = CinemaHallFactory(name="Red"), CinemaHallFactory(name="Blue")
+    sold = []
+    for hall, date in [(red, START), (blue, START + timedelta(hours=2))]:
+        seats = [SeatFactory(hall=hall, row=1, number=number) for number in (1, 2, 3)]
+        screening = MovieScreeningFactory(movie=movie, hall=hall, date=date)
+        for seat in seats:
+            sold.append(TicketFactory(movie_screening=screening, seat=seat, price=20))
+    MovieScreeningFactory(hall=red, date=START - timedelta(days=10))
+    return sold
+
+
+def export(api_client, name, fmt, **params):
+    response = api_client.get(
+        reverse("export", kwargs={"name": name, "fmt": fmt}), {**RANGE, **params}
+    )
+    assert response.status_code == 200
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_tickets_stream_as_csv_in_chunks(api_client, tickets, monkeypatch):
+    monkeypatch.setattr(exports, "CHUNK_SIZE", 2)
+
+    rows = list(csv.reader(io.StringIO(export(api_client, "tickets", "csv"))))
+
+    assert rows[0] == list(exports.TICKET_COLUMNS)
+    assert [int(row[0]) for row in rows[1:]] == [ticket.pk for ticket in tickets]
+    assert rows[1][2:] == [
+        "2026-03-02T10:00:00+00:00",
+        str(tickets[0].movie_screening.movie_id),
+        "Heat",
+        str(tickets[0].movie_screening.hall_id),
+        "Red",
+        "1",
+        "1",
+        "20",
+    ]
+
+
+@pytest.mark.django_db
+def test_tickets_stream_as_ndjson_filtered_by_hall(api_client, tickets):
+    hall = tickets[-1].movie_screening.hall_id
+
+    lines = export(api_client, "tickets", "ndjson", hall=hall).splitlines()
+
+    rows = [json.loads(line) for line in lines]
+    assert [row["id"] for row in rows] == [ticket.pk for ticket in tickets[3:]]
+    assert rows[0]["hall_name"] == "Blue"
+    assert rows[0]["date"] == "2026-03-02T12:00:00Z"
+
+
+@pytest.mark.django_db
+def test_sales_export(api_client, tickets):
+    rows = list(csv.DictReader(io.StringIO(export(api_client, "sales", "csv"))))
+
+    assert [(row["hall_name"], row["seats_sold"], row["revenue"]) for row in rows] == [
+        ("Red", "3", "60"),
+        ("Blue", "3", "60"),
+    ]
+    assert rows[0]["occupancy"] == "100.0"
+
+
+@pytest.mark.django_db
+def test_exports_stream_chunk_by_chunk_under_asgi(tickets, monkeypatch):
+    monkeypatch.setattr(exports, "CHUNK_SIZE", 2)
+    url = reverse("export", kwargs={"name": "tickets", "fmt": "ndjson"})
+
+    async def read():
+        response = await AsyncClient().get(url, RANGE)
+        return response.is_async, [chunk async for chunk in response]
+
+    is_async, chunks = async_to_sync(read)()
+
+    assert is_async
+    assert len(chunks) == 3
+    assert b"".join(chunks).count(b"\n") == len(tickets)
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_exports_and_bad_ranges(api_client):
+    url = reverse("export", kwargs={"name": "seats", "fmt": "csv"})
+    assert api_client.get(url).status_code == 404
+
+    url = reverse("export", kwargs={"name": "tickets", "fmt": "csv"})
+    response = api_client.get(url, {"from": "2026-03-01T00:00:00Z", "to": "2028-01-01"})
+    assert response.status_code == 400
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from core.filters import search
+from core.models import Movie
+from core.tests.factories import (
+    ActorFactory,
+    CinemaHallFactory,
+    GenreFactory,
+    MovieFactory,
+    MovieScreeningFactory,
+    TicketFactory,
+)
+
+START = datetime(2026, 3, 2, 10, tzinfo=timezone.utc)
+
+
+def ids(response):
+    assert response.status_code == 200
+    return [row["id"] for row in response.data["results"]]
+
+
+@pytest.mark.django_db
+def test_movie_filters(api_client):
+    family, horror = GenreFactory(is_for_adults=False), GenreFactory(is_for_adults=True)
+    actor = ActorFactory()
+    short = MovieFactory(duration=80, genres=[family], actors=[actor])
+    long = MovieFactory(duration=180, genres=[family, horror])
+    url = reverse("movie-list")
+
+    assert ids(api_client.get(url, {"genre": horror.pk})) == [long.pk]
+    assert ids(api_client.get(url, {"actor": actor.pk})) == [short.pk]
+    assert ids(api_client.get(url, {"duration_min": 90})) == [long.pk]
+    assert ids(api_client.get(url, {"duration_max": 90})) == [short.pk]
+    assert ids(api_client.get(url, {"adult": "true"})) == [long.pk]
+    assert ids(api_client.get(url, {"adult": "false"})) == [short.pk]
+    assert ids(api_client.get(url)) == [short.pk, long.pk]
+
+
+@pytest.mark.django_db
+def test_movie_search_matches_words_and_typos(api_client):
+    heat = MovieFactory(title="Heat")
+    godfather = MovieFactory(title="The Godfather Part II")
+    MovieFactory(title="Alien")
+    url = reverse("movie-list")
+
+    assert ids(api_client.get(url, {"search": "godfather"})) == [godfather.pk]
+    assert ids(api_client.get(url, {"search": "godfater"})) == [godfather.pk]
+    assert ids(api_client.get(url, {"search": "heat"})) == [heat.pk]
+
+
+@pytest.mark.django_db
+def test_actor_search(api_client):
+    actor = ActorFactory(name="Al Pacino")
+    ActorFactory(name="Robert De Niro")
+
+    response = api_client.get(reverse("actor-list"), {"search": "pacin"})
+
+    assert ids(response) == [actor.pk]
+
+
+@pytest.mark.django_db
+def test_search_uses_indexes():
+    MovieFactory.create_batch(3)
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    queryset = search(Movie.objects.all(), "title", "heat")
+
+    plan = queryset.explain()
+
+    assert "movie_title_search_idx" in plan
+    assert "movie_title_trgm_idx" in plan
+
+
+@pytest.mark.django_db
+def test_screening_filters(api_client):
+    hall = CinemaHallFactory()
+    first = MovieScreeningFactory(hall=hall, date=START)
+    second = MovieScreeningFactory(movie=first.movie, date=START + timedelta(days=1))
+    third = MovieScreeningFactory(hall=hall, date=START + timedelta(days=2))
+    url = reverse("screening-list")
+
+    assert ids(api_client.get(url, {"hall": hall.pk})) == [first.pk, third.pk]
+    assert ids(api_client.get(url, {"movie": first.movie_id})) == [
+        first.pk,
+        second.pk,
+    ]
+    response = api_client.get(
+        url,
+        {
+            "date_after": (START + timedelta(hours=1)).isoformat(),
+            "date_before": (START + timedelta(days=2)).isoformat(),
+        },
+    )
+    assert ids(response) == [second.pk, third.pk]
+
+
+@pytest.mark.django_db
+def test_ticket_filter_and_invalid_values(api_client):
+    ticket = TicketFactory()
+    TicketFactory()
+    url = reverse("ticket-list")
+
+    assert ids(api_client.get(url, {"screening": ticket.movie_screening_id})) == [
+        ticket.pk
+    ]
+    assert api_client.get(url, {"screening": "x"}).status_code == 400
@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+
+from core.holds import CacheHoldBackend, DatabaseHoldBackend
+from core.models import SeatHold, Ticket
+from core.tests.factories import MovieScreeningFactory, SeatFactory, TicketFactory
+
+
+@pytest.fixture(params=[DatabaseHoldBackend, CacheHoldBackend])
+def backend(request):
+    return request.param()
+
+
+@pytest.fixture
+def screening():
+    return MovieScreeningFactory()
+
+
+@pytest.fixture
+def seats(screening):
+    return [SeatFactory(hall=screening.hall, row=1, number=n) for n in range(1, 4)]
+
+
+@pytest.mark.django_db
+def test_hold_is_all_or_nothing(backend, screening, seats):
+    first = backend.hold(screening.pk, [seats[0].pk, seats[1].pk], ttl=60)
+    second = backend.hold(screening.pk, [seats[1].pk, seats[2].pk], ttl=60)
+
+    assert second is None
+    assert backend.held_seats(screening.pk, [seat.pk for seat in seats]) == {
+        seats[0].pk: first.token,
+        seats[1].pk: first.token,
+    }
+
+
+@pytest.mark.django_db
+def test_hold_expires(backend, screening, seats):
+    with freeze_time(timezone.now()) as frozen:
+        backend.hold(screening.pk, [seats[0].pk], ttl=60)
+        frozen.tick(timedelta(seconds=61))
+
+        assert backend.held_seats(screening.pk, [seats[0].pk]) == {}
+        assert backend.hold(screening.pk, [seats[0].pk], ttl=60) is not None
+
+
+@pytest.mark.django_db
+def test_release_single_seat(backend, screening, seats):
+    hold = backend.hold(screening.pk, [seats[0].pk, seats[1].pk], ttl=60)
+
+    backend.release(screening.pk, hold.token, [seats[0].pk])
+
+    assert backend.held_seats(screening.pk, [seats[0].pk, seats[1].pk]) == {
+        seats[1].pk: hold.token
+    }
+
+
+@pytest.mark.django_db
+def test_reap_deletes_only_expired_holds(settings, screening, seats):
+    settings.SEAT_HOLDS = {
+        **settings.SEAT_HOLDS,
+        "BACKEND": "core.holds.DatabaseHoldBackend",
+    }
+    backend = DatabaseHoldBackend()
+    with freeze_time(timezone.now()) as frozen:
+        backend.hold(screening.pk, [seats[0].pk, seats[1].pk], ttl=30)
+        backend.hold(screening.pk, [seats[2].pk], ttl=120)
+        frozen.tick(timedelta(seconds=60))
+
+        call_command("reap_seat_holds")
+
+    assert list(SeatHold.objects.values_list("seat_id", flat=True)) == [seats[2].pk]
+
+
+@pytest.mark.django_db
+def test_held_seat_can_only_be_bought_with_its_hold(api_client, screening, seats):
+    response = api_client.post(
+        reverse("screening-hold", kwargs={"pk": screening.pk}),
+        {"seats": [seats[0].pk]},
+        format="json",
+    )
+    token = response.data["token"]
+    ticket = {"movie_screening": screening.pk, "seat": seats[0].pk}
+
+    seat_map = api_client.get(
+        reverse("screening-seat-map", kwargs={"pk": screening.pk})
+    )
+    stranger = api_client.post(reverse("ticket-list"), ticket)
+    holder = api_client.post(reverse("ticket-list"), {**ticket, "hold": token})
+
+    assert response.status_code == 201
+    assert seat_map.data["seats"] == "200"
+    assert stranger.status_code == 409
+    assert holder.status_code == 201
+    assert Ticket.objects.filter(seat=seats[0]).count() == 1
+
+
+@pytest.mark.django_db
+def test_sold_or_held_seats_cannot_be_held(api_client, screening, seats):
+    TicketFactory(movie_screening=screening, seat=seats[0])
+    url = reverse("screening-hold", kwargs={"pk": screening.pk})
+    api_client.post(url, {"seats": [seats[1].pk]}, format="json")
+
+    sold = api_client.post(url, {"seats": [seats[0].pk]}, format="json")
+    held = api_client.post(url, {"seats": [seats[1].pk]}, format="json")
+    foreign = api_client.post(url, {"seats": [SeatFactory().pk]}, format="json")
+
+    assert sold.status_code == 409
+    assert held.status_code == 409
+    assert foreign.status_code == 400
+
+
+@pytest.mark.django_db
+def test_released_hold_frees_seats(api_client, screening, seats):
+    url = reverse("screening-hold", kwargs={"pk": screening.pk})
+    token = api_client.post(url, {"seats": [seats[0].pk]}, format="json").data["token"]
+
+    response = api_client.delete(
+        reverse("screening-hold-release", kwargs={"pk": screening.pk, "token": token})
+    )
+
+    assert response.status_code == 204
+    assert (
+        api_client.post(url, {"seats": [seats[0].pk]}, format="json").status_code == 201
+    )
+
+
+@pytest.mark.django_db
+def test_release_is_scoped_to_the_screening(backend, screening, seats):
+    other = MovieScreeningFactory(hall=screening.hall)
+    hold = backend.hold(screening.pk, [seats[0].pk], ttl=60)
+
+    assert backend.release(other.pk, hold.token) == []
+    assert backend.held_seats(screening.pk, [seats[0].pk]) == {seats[0].pk: hold.token}
+    assert backend.release(screening.pk, hold.token) == [seats[0].pk]
+
+
+@pytest.mark.django_db
+def test_releasing_another_screenings_hold_is_not_found(api_client, screening, seats):
+    other = MovieScreeningFactory(hall=screening.hall)
+    url = reverse("screening-hold", kwargs={"pk": screening.pk})
+    token = api_client.post(url, {"seats": [seats[0].pk]}, format="json").data["token"]
+
+    response = api_client.delete(
+        reverse("screening-hold-release", kwargs={"pk": other.pk, "token": token})
+    )
+
+    assert response.status_code == 404
+    assert (
+        api_client.post(url, {"seats": [seats[0].pk]}, format="json").status_code == 409
+    )
@@ -0,0 +1,70 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from core.instrumentation import RequestMetrics, request_stats, reset_request_stats
+from core.tests.factories import GenreFactory, MovieFactory
+
+
+@pytest.fixture(autouse=True)
+def metrics(settings):
+    settings.REQUEST_METRICS = {**settings.REQUEST_METRICS, "SAMPLE_RATE": 1.0}
+    reset_request_stats()
+    yield settings.REQUEST_METRICS
+    reset_request_stats()
+
+
+@pytest.mark.django_db
+def test_sampled_requests_get_server_timing_and_histograms(api_client):
+    GenreFactory.create_batch(3)
+
+    response = api_client.get(reverse("genre-list"))
+
+    assert response["Server-Timing"].startswith("db;dur=")
+    # The conditional GET aggregate and the page itself.
+    assert 'desc="2 queries"' in response["Server-Timing"]
+    stats = request_stats()["genre-list"]
+    assert stats["queries"]["count"] == 1
+    assert stats["queries"]["sum"] == 2
+    assert stats["response_bytes"]["sum"] == len(response.content)
+    assert stats["render_ms"]["buckets"]["+Inf"] == 1
+
+
+@pytest.mark.django_db
+def test_async_views_are_measured():
+    MovieFactory()
+
+    response = async_to_sync(AsyncClient().get)(
+        reverse("async-schedule"), {"from": "2026-01-01T00:00:00Z"}
+    )
+
+    assert response.status_code == 200
+    assert 'desc="1 queries"' in response["Server-Timing"]
+    assert request_stats()["async-schedule"]["queries"]["sum"] == 1
+
+
+@pytest.mark.django_db
+def test_unsampled_requests_are_not_measured(api_client, metrics):
+    metrics["SAMPLE_RATE"] = 0
+
+    response = api_client.get(reverse("genre-list"))
+
+    assert "Server-Timing" not in response
+    assert request_stats() == {}
+
+
+def test_repeated_and_slow_queries_are_logged(metrics, caplog):
+    recorder = RequestMetrics()
+    recorder.queries = [('SELECT * FROM "core_seat" WHERE id = %s', 1.0)] * 5
+    recorder.queries.append(("SELECT pg_sleep(1)", 1000.0))
+
+    with caplog.at_level(logging.WARNING, logger="core.instrumentation"):
+        recorder.report("seat-list", metrics)
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Slow query in seat-list (1000.0 ms): SELECT pg_sleep(1)",
+        'seat-list ran the same query 5 times: SELECT * FROM "core_seat" WHERE id = %s',
+    ]
@@ -0,0 +1,93 @@
+import pytest
+from django.urls import reverse
+
+from core.models import Seat
+from core.tests.factories import CinemaHallFactory, SeatFactory, TicketFactory
+
+
+@pytest.fixture
+def hall():
+    return CinemaHallFactory()
+
+
+def post_layout(api_client, hall, payload):
+    return api_client.post(
+        reverse("cinema-hall-layout", kwargs={"pk": hall.pk}), payload, format="json"
+    )
+
+
+@pytest.mark.django_db
+def test_layout_is_created_with_gaps_in_bulk(
+    api_client, hall, django_assert_max_num_queries
+):
+    payload = {
+        "rows": [
+            {"row": 1, "seats": 20, "gaps": [1, 20]},
+            {"row": 2, "seats": 22},
+            {"row": 3, "seats": 22, "gaps": [11, 12]},
+        ]
+    }
+
+    with django_assert_max_num_queries(7):
+        response = post_layout(api_client, hall, payload)
+
+    assert response.status_code == 201
+    assert response.data == {"created": 60, "deleted": 0}
+    assert not Seat.objects.filter(hall=hall, row=3, number__in=[11, 12]).exists()
+    assert Seat.objects.filter(hall=hall, row=2).count() == 22
+
+
+@pytest.mark.django_db
+def test_layout_is_validated_in_one_pass(api_client, hall):
+    response = post_layout(
+        api_client,
+        hall,
+        {"rows": [{"row": 1, "seats": 5, "gaps": [6]}, {"row": 1, "seats": 0}]},
+    )
+
+    assert response.status_code == 400
+    assert Seat.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_layout_size_is_capped(api_client, hall):
+    too_many_rows = post_layout(
+        api_client, hall, {"rows": [{"row": row, "seats": 1} for row in range(1, 202)]}
+    )
+    too_wide = post_layout(api_client, hall, {"rows": [{"row": 1, "seats": 501}]})
+    too_many_seats = post_layout(
+        api_client,
+        hall,
+        {"rows": [{"row": row, "seats": 500} for row in range(1, 22)]},
+    )
+
+    assert too_many_rows.status_code == 400
+    assert too_wide.status_code == 400
+    assert too_many_seats.data["rows"] == ["A hall may have at most 10000 seats."]
+    assert Seat.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_existing_layout_needs_replace(api_client, hall):
+    SeatFactory.create_batch(3, hall=hall)
+    payload = {"rows": [{"row": 1, "seats": 10}]}
+
+    kept = post_layout(api_client, hall, payload)
+    replaced = post_layout(api_client, hall, {**payload, "replace": True})
+
+    assert kept.status_code == 400
+    assert replaced.status_code == 201
+    assert replaced.data == {"created": 10, "deleted": 3}
+    assert Seat.objects.filter(hall=hall).count() == 10
+
+
+@pytest.mark.django_db
+def test_layout_with_sold_tickets_is_not_replaced(api_client, hall):
+    TicketFactory(seat__hall=hall)
+
+    response = post_layout(
+        api_client, hall, {"rows": [{"row": 1, "seats": 10}], "replace": True}
+    )
+
+    assert response.status_code == 400
+    assert Seat.objects.filter(hall=hall).count() == 1
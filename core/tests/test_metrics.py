@@ -0,0 +1,133 @@
+import multiprocessing
+import threading
+
+import pytest
+from django.urls import reverse
+
+from core.metrics import (
+    ARCHIVE,
+    Counter,
+    Histogram,
+    collect,
+    registry,
+    reset_metrics,
+)
+from core.tests.factories import GenreFactory, MovieScreeningFactory, SeatFactory
+
+
+@pytest.fixture(autouse=True)
+def metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+def scrape(api_client):
+    response = api_client.get(reverse("metrics"))
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.content.decode().splitlines():
+        if not line.startswith("#"):
+            key, value = line.rsplit(" ", 1)
+            samples[key] = float(value)
+    return samples
+
+
+@pytest.mark.django_db
+def test_ticket_sales_and_conflicts_are_counted(
+    api_client, django_capture_on_commit_callbacks
+):
+    screening = MovieScreeningFactory()
+    seat = SeatFactory(hall=screening.hall)
+    payload = {"movie_screening": screening.pk, "seat": seat.pk}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(reverse("ticket-list"), payload)
+        api_client.post(reverse("ticket-list"), payload)
+
+    samples = scrape(api_client)
+    assert samples["tickets_sold_total"] == 1
+    assert samples['booking_conflicts_total{operation="purchase",reason="sold"}'] == 1
+    assert samples['http_responses_total{status="409",view="ticket-list"}'] == 1
+
+
+@pytest.mark.django_db
+def test_seat_map_latency_and_cache_results_are_recorded(api_client):
+    screening = MovieScreeningFactory()
+    GenreFactory()
+    api_client.get(reverse("screening-seat-map", kwargs={"pk": screening.pk}))
+    api_client.get(reverse("genre-list"))
+    api_client.get(reverse("genre-list"))
+
+    samples = scrape(api_client)
+    assert samples['seat_map_duration_seconds_count{mode="sync"}'] == 1
+    assert samples['seat_map_duration_seconds_bucket{mode="sync",le="+Inf"}'] == 1
+    assert (
+        samples['response_cache_requests_total{result="hit",view="GenreViewSet"}'] == 1
+    )
+    assert (
+        samples['response_cache_requests_total{result="miss",view="GenreViewSet"}'] == 1
+    )
+    assert samples['db_query_duration_seconds_count{database="default"}'] > 0
+
+
+def record(counter, histogram):
+    counter.inc(2, kind="a")
+    histogram.observe(0.3)
+
+
+def test_file_shards_add_up_across_threads_and_processes(settings, tmp_path):
+    settings.METRICS = {"DIRECTORY": str(tmp_path)}
+    counter = Counter("test_events_total", "Test events.")
+    histogram = Histogram("test_seconds", "Test latency.", buckets=(0.1, 0.5))
+    try:
+        record(counter, histogram)
+        thread = threading.Thread(target=record, args=(counter, histogram))
+        thread.start()
+        thread.join()
+        process = multiprocessing.get_context("fork").Process(
+            target=record, args=(counter, histogram)
+        )
+        process.start()
+        process.join()
+
+        values = collect()
+        samples = dict(histogram.samples(values))
+    finally:
+        del registry["test_events_total"], registry["test_seconds"]
+
+    assert process.exitcode == 0
+    # The exited process's file was folded into the archive.
+    assert len(list(tmp_path.glob("metrics-*.db"))) == 3
+    assert (tmp_path / ARCHIVE).exists()
+    assert values['test_events_total{kind="a"}'] == 6
+    assert samples['test_seconds_bucket{le="0.1"}'] == 0
+    assert samples['test_seconds_bucket{le="0.5"}'] == 3
+    assert samples['test_seconds_bucket{le="+Inf"}'] == 3
+    assert samples["test_seconds_sum"] == pytest.approx(0.9)
+
+
+def test_file_shards_are_reused_and_archived(settings, tmp_path):
+    settings.METRICS = {"DIRECTORY": str(tmp_path)}
+    counter = Counter("test_events_total", "Test events.")
+    histogram = Histogram("test_seconds", "Test latency.", buckets=(0.1, 0.5))
+    try:
+        for _ in range(5):
+            thread = threading.Thread(target=record, args=(counter, histogram))
+            thread.start()
+            thread.join()
+        for _ in range(3):
+            process = multiprocessing.get_context("fork").Process(
+                target=record, args=(counter, histogram)
+            )
+            process.start()
+            process.join()
+            values = collect()
+    finally:
+        del registry["test_events_total"], registry["test_seconds"]
+
+    # One shard for all the threads, and one archive for all the processes.
+    names = {path.name for path in tmp_path.glob("metrics-*.db")}
+    assert len(names) == 2 and ARCHIVE in names
+    assert values['test_events_total{kind="a"}'] == 16
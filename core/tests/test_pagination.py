@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.tests.factories import GenreFactory, MovieScreeningFactory
+
+
+def walk(api_client, url, **params):
+    pages = []
+    response = api_client.get(url, params)
+    while True:
+        pages.append(response.data["results"])
+        if response.data["next"] is None:
+            return pages
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(response.data["next"])
+        assert not any("OFFSET" in query["sql"] for query in queries)
+
+
+@pytest.mark.django_db
+def test_list_is_paginated_by_cursor(api_client):
+    genres = GenreFactory.create_batch(7)
+
+    pages = walk(api_client, reverse("genre-list"), page_size=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [genre["id"] for page in pages for genre in page] == [
+        genre.pk for genre in genres
+    ]
+
+
+@pytest.mark.django_db
+def test_page_size_is_capped(api_client):
+    GenreFactory.create_batch(3)
+
+    response = api_client.get(reverse("genre-list"), {"page_size": 10_000})
+
+    assert response.status_code == 200
+    assert "count" not in response.data
+    assert len(response.data["results"]) == 3
+
+
+@pytest.mark.django_db
+def test_screenings_are_paginated_by_date(api_client):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    screenings = [
+        MovieScreeningFactory(date=start + timedelta(hours=hours))
+        for hours in [5, 1, 3, 3, 2]
+    ]
+
+    pages = walk(api_client, reverse("screening-list"), page_size=2)
+
+    expected = sorted(screenings, key=lambda screening: (screening.date, screening.pk))
+    assert [screening["id"] for page in pages for screening in page] == [
+        screening.pk for screening in expected
+    ]
@@ -0,0 +1,105 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.urls import reverse
+
+from core.models import Ticket
+from core.pricing import PriceRules, get_price_rules, quote_seats
+from core.tests.factories import MovieScreeningFactory, SeatFactory, TicketFactory
+
+# A Monday evening and a Saturday morning.
+MONDAY_EVENING = datetime(2026, 3, 2, 18, tzinfo=timezone.utc)
+SATURDAY_MORNING = datetime(2026, 3, 7, 10, tzinfo=timezone.utc)
+
+PRICING = {
+    "RULES": "core.pricing.PriceRules",
+    "OPTIONS": {
+        "base": 20,
+        "time_slots": ((0, 0.5), (17, 1.5)),
+        "weekdays": (1, 1, 1, 1, 1, 2, 2),
+        "zones": ((0.5, 1), (1, 2)),
+        "occupancy": ((0.5, 1), (1, 1.5)),
+    },
+}
+
+
+@pytest.fixture
+def rules():
+    with override_settings(PRICING=PRICING):
+        rules = get_price_rules()
+        rules.table.cache_clear()
+        yield rules
+
+
+def seat_rows(rows, per_row, sold=0):
+    seats = [
+        (row * 100 + number, row, number, False)
+        for row in range(1, rows + 1)
+        for number in range(1, per_row + 1)
+    ]
+    return [(*seat[:3], index < sold) for index, seat in enumerate(seats)]
+
+
+def test_prices_by_slot_weekday_zone_and_occupancy(rules):
+    evening = MovieScreeningFactory.build(pk=1, date=MONDAY_EVENING)
+    morning = MovieScreeningFactory.build(pk=2, date=SATURDAY_MORNING)
+
+    assert quote_seats(evening, seat_rows(4, 1)) == [30, 30, 60, 60]
+    assert quote_seats(morning, seat_rows(4, 1)) == [20, 20, 40, 40]
+    assert quote_seats(evening, seat_rows(4, 1, sold=3)) == [45, 45, 90, 90]
+
+
+def test_rules_are_compiled_once_per_screening(rules):
+    screening = MovieScreeningFactory.build(pk=1, date=MONDAY_EVENING)
+
+    for sold in range(10):
+        quote_seats(screening, seat_rows(10, 10, sold))
+    screening.date = SATURDAY_MORNING
+    quote_seats(screening, seat_rows(10, 10))
+
+    info = rules.table.cache_info()
+    assert (info.misses, info.hits) == (2, 9)
+
+
+def test_rules_must_cover_every_case():
+    with pytest.raises(ImproperlyConfigured):
+        PriceRules(**{**PRICING["OPTIONS"], "zones": ((0.5, 1),)})
+
+
+@pytest.mark.django_db
+def test_purchases_are_priced_by_the_server(api_client, rules):
+    screening = MovieScreeningFactory(date=MONDAY_EVENING)
+    front, back = (SeatFactory(hall=screening.hall, row=row) for row in (1, 2))
+
+    response = api_client.post(
+        reverse("ticket-list"),
+        {"movie_screening": screening.pk, "seat": back.pk, "price": 1},
+    )
+    batch = api_client.post(
+        reverse("ticket-batch"),
+        {"movie_screening": screening.pk, "tickets": [{"seat": front.pk}]},
+        format="json",
+    )
+
+    assert response.status_code == 201
+    assert response.data["price"] == 60
+    assert batch.status_code == 201
+    # Half the seats were sold before the batch, which is still the first band.
+    assert batch.data[0]["price"] == 30
+    assert sorted(Ticket.objects.values_list("price", flat=True)) == [30, 60]
+
+
+@pytest.mark.django_db
+def test_seat_map_quotes_every_seat(api_client, rules):
+    screening = MovieScreeningFactory(date=MONDAY_EVENING)
+    seats = [SeatFactory(hall=screening.hall, row=row, number=1) for row in (1, 2)]
+    TicketFactory(movie_screening=screening, seat=seats[0])
+
+    response = api_client.get(
+        reverse("screening-seat-map", kwargs={"pk": screening.pk})
+    )
+
+    assert response.data["ids"] == [seat.pk for seat in seats]
+    assert response.data["prices"] == [30, 60]
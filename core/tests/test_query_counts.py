@@ -0,0 +1,77 @@
+import pytest
+from django.urls import reverse
+
+from core.tests.factories import (
+    ActorFactory,
+    CinemaHallFactory,
+    GenreFactory,
+    MovieFactory,
+    MovieScreeningFactory,
+    SeatFactory,
+    TicketFactory,
+)
+from core.tests.utils import assert_constant_queries
+
+
+def create_movies(size):
+    MovieFactory.create_batch(
+        size,
+        genres=GenreFactory.create_batch(2),
+        actors=ActorFactory.create_batch(3),
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url, factory",
+    [
+        ("genre-list", GenreFactory),
+        ("actor-list", ActorFactory),
+        ("cinema-hall-list", CinemaHallFactory),
+        ("seat-list", SeatFactory),
+        ("screening-list", MovieScreeningFactory),
+        ("ticket-list", TicketFactory),
+    ],
+)
+def test_list_views_use_constant_queries(api_client, url, factory):
+    assert_constant_queries(api_client, reverse(url), factory.create_batch)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "expand, queries",
+    [("", 4), ("genres", 5), ("actors", 5), ("genres,actors", 6)],
+)
+def test_movie_list_uses_constant_queries(api_client, expand, queries):
+    url = f"{reverse('movie-list')}?expand={expand}"
+
+    assert assert_constant_queries(api_client, url, create_movies) == queries
+
+
+@pytest.mark.django_db
+def test_movie_list_expands_related_objects(api_client):
+    genre = GenreFactory()
+    actor = ActorFactory()
+    MovieFactory(genres=[genre], actors=[actor])
+
+    plain = api_client.get(reverse("movie-list"))
+    expanded = api_client.get(reverse("movie-list"), {"expand": "genres,actors"})
+
+    assert plain.data["results"][0]["genres"] == [genre.pk]
+    assert expanded.data["results"][0]["genres"][0]["name"] == genre.name
+    assert expanded.data["results"][0]["actors"][0]["name"] == actor.name
+
+
+@pytest.mark.django_db
+def test_movie_writes_ignore_expand(api_client):
+    genre = GenreFactory()
+    actor = ActorFactory()
+
+    response = api_client.post(
+        f"{reverse('movie-list')}?expand=genres",
+        {"title": "Heat", "duration": 170, "genres": [genre.pk], "actors": [actor.pk]},
+        format="json",
+    )
+
+    assert response.status_code == 201
+    assert response.data["genres"] == [genre.pk]
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from core.models import MovieScreening, ScreeningSales, Ticket
+from core.reports import refresh_sales_summary, revenue
+from core.tests.factories import (
+    CinemaHallFactory,
+    MovieFactory,
+    MovieScreeningFactory,
+    SeatFactory,
+    TicketFactory,
+)
+
+START = datetime(2026, 3, 2, 10, tzinfo=timezone.utc)
+RANGE = {"from": "2026-03-01T00:00:00Z", "to": "2026-04-01T00:00:00Z"}
+
+
+@pytest.fixture
+def sales():
+    hall = CinemaHallFactory(name="Red")
+    seats = SeatFactory.create_batch(4, hall=hall)
+    heat = MovieFactory(title="Heat", duration=170)
+    alien = MovieFactory(title="Alien")
+    screenings = [
+        MovieScreeningFactory(movie=heat, hall=hall, date=START),
+        MovieScreeningFactory(movie=heat, hall=hall, date=START + timedelta(days=1)),
+        MovieScreeningFactory(movie=alien, hall=hall, date=START + timedelta(hours=3)),
+    ]
+    for screening, prices in zip(screenings, [[30, 30, 20], [20], [25, 25]]):
+        for seat, price in zip(seats, prices):
+            TicketFactory(movie_screening=screening, seat=seat, price=price)
+    return {"hall": hall, "heat": heat, "alien": alien, "screenings": screenings}
+
+
+@pytest.mark.django_db
+def test_revenue_per_movie_in_one_query(api_client, sales, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        response = api_client.get(reverse("report-revenue"), RANGE)
+
+    assert response.status_code == 200
+    assert response.data["tickets"] == 6
+    assert response.data["revenue"] == 150
+    assert response.data["results"] == [
+        {
+            "movie": sales["heat"].pk,
+            "movie_title": "Heat",
+            "tickets": 4,
+            "revenue": 100,
+            "share": 66.67,
+            "rank": 1,
+        },
+        {
+            "movie": sales["alien"].pk,
+            "movie_title": "Alien",
+            "tickets": 2,
+            "revenue": 50,
+            "share": 33.33,
+            "rank": 2,
+        },
+    ]
+
+
+@pytest.mark.django_db
+def test_revenue_per_day_and_hall(api_client, sales):
+    response = api_client.get(reverse("report-revenue"), {**RANGE, "group": "day,hall"})
+
+    assert [
+        (row["day"], row["hall_name"], row["revenue"], row["rank"])
+        for row in response.json()["results"]
+    ] == [("2026-03-02", "Red", 130, 1), ("2026-03-03", "Red", 20, 2)]
+
+
+@pytest.mark.django_db
+def test_revenue_rejects_unknown_groups(api_client):
+    response = api_client.get(reverse("report-revenue"), {"group": "movie,seat"})
+
+    assert response.status_code == 400
+    assert "group" in response.data
+
+
+@pytest.mark.django_db
+def test_occupancy_per_screening(api_client, sales):
+    response = api_client.get(reverse("report-occupancy"), RANGE)
+
+    assert [
+        (row["movie_title"], row["seats_sold"], row["revenue"], row["occupancy"])
+        for row in response.data["results"]
+    ] == [("Heat", 3, 80, 75.0), ("Alien", 2, 50, 50.0), ("Heat", 1, 20, 25.0)]
+
+
+@pytest.mark.django_db
+def test_summary_is_refreshed_incrementally(sales):
+    date_from, date_to = START - timedelta(days=1), START + timedelta(days=30)
+    call_command("refresh_sales_summary", "--full")
+    assert list(revenue(date_from, date_to, summary=True)) == list(
+        revenue(date_from, date_to, summary=False)
+    )
+
+    MovieScreening.objects.update(updated_at=START)
+    Ticket.objects.update(updated_at=START)
+    sold = sales["screenings"][1]
+    TicketFactory(movie_screening=sold, seat=SeatFactory(hall=sales["hall"]), price=40)
+    refunded = sales["screenings"][2].ticket.first()
+    refunded.delete()
+
+    assert refresh_sales_summary() == 2
+    assert list(revenue(date_from, date_to, summary=True)) == list(
+        revenue(date_from, date_to, summary=False)
+    )
+    assert (
+        ScreeningSales.objects.get(movie_screening=refunded.movie_screening) is not None
+    )
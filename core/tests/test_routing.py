@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.db import router, transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import Movie, MovieScreening
+from core.routing import PIN_COOKIE, routed
+from core.tests.factories import (
+    CinemaHallFactory,
+    MovieFactory,
+    MovieScreeningFactory,
+    TicketFactory,
+)
+
+# The test replica is a separate database that nothing replicates to, so a
+# read it serves never sees rows written to the primary.
+with_replica = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = {"ALIASES": ["replica"], "PIN_SECONDS": 5}
+
+
+def screening_ids(response):
+    return [screening["id"] for screening in response.data["results"]]
+
+
+@with_replica
+def test_safe_requests_read_from_a_replica(api_client, replica):
+    MovieScreeningFactory()
+
+    response = api_client.get(reverse("screening-list"))
+
+    assert response.status_code == 200
+    assert screening_ids(response) == []
+    assert PIN_COOKIE not in response.cookies
+
+
+@with_replica
+def test_clients_read_their_writes_from_the_primary(api_client, replica):
+    created = api_client.post(
+        reverse("screening-list"),
+        {
+            "movie": MovieFactory().pk,
+            "hall": CinemaHallFactory().pk,
+            "date": datetime(2026, 3, 2, 10, tzinfo=timezone.utc).isoformat(),
+        },
+    )
+    pinned = api_client.get(reverse("screening-list"))
+    api_client.cookies.pop(PIN_COOKIE)
+    unpinned = api_client.get(reverse("screening-list"))
+
+    assert created.status_code == 201
+    assert created.cookies[PIN_COOKIE]["max-age"] == 5
+    assert screening_ids(pinned) == [created.data["id"]]
+    assert screening_ids(unpinned) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_follow_writes_and_transactions_to_the_primary():
+    assert router.db_for_read(Movie) == "default"
+    with routed("replica"):
+        assert router.db_for_read(Movie) == "replica"
+        with transaction.atomic():
+            assert router.db_for_read(Movie) == "default"
+        assert router.db_for_write(MovieScreening) == "default"
+        assert router.db_for_read(Movie) == "default"
+
+
+@with_replica
+def test_streamed_exports_read_from_the_replica(api_client, replica):
+    TicketFactory(movie_screening__date=datetime(2026, 3, 2, tzinfo=timezone.utc))
+
+    response = api_client.get(
+        reverse("export", kwargs={"name": "tickets", "fmt": "ndjson"}),
+        {"from": "2026-03-01T00:00:00Z", "to": "2026-04-01T00:00:00Z"},
+    )
+
+    assert b"".join(response.streaming_content) == b""
+
+
+@with_replica
+def test_cached_views_fill_the_cache_from_the_primary(api_client, replica):
+    url = reverse("genre-list")
+
+    created = api_client.post(url, {"name": "Noir"})
+    unpinned = [APIClient().get(url) for _ in range(2)]
+    pinned = api_client.get(url)
+
+    assert created.status_code == 201
+    assert [response["X-Cache"] for response in unpinned] == ["MISS", "HIT"]
+    assert pinned["X-Cache"] == "HIT"
+    for response in [*unpinned, pinned]:
+        assert [genre["name"] for genre in response.data["results"]] == ["Noir"]
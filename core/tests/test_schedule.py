@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.urls import reverse
+
+from core.tests.factories import (
+    CinemaHallFactory,
+    GenreFactory,
+    MovieFactory,
+    MovieScreeningFactory,
+    SeatFactory,
+    TicketFactory,
+)
+
+START = datetime(2026, 3, 2, 10, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def hall():
+    hall = CinemaHallFactory(name="Red")
+    SeatFactory.create_batch(5, hall=hall)
+    return hall
+
+
+def get_schedule(api_client, **params):
+    params.setdefault("from", START.isoformat())
+    return api_client.get(reverse("schedule"), params)
+
+
+@pytest.mark.django_db
+def test_schedule_is_denormalized(api_client, hall, django_assert_num_queries):
+    movie = MovieFactory(title="Heat", duration=170)
+    screening = MovieScreeningFactory(movie=movie, hall=hall, date=START)
+    for seat in hall.seat.all()[:2]:
+        TicketFactory(movie_screening=screening, seat=seat)
+
+    with django_assert_num_queries(2):
+        response = get_schedule(api_client)
+
+    assert response.status_code == 200
+    assert response.data["results"] == [
+        {
+            "id": screening.pk,
+            "date": "2026-03-02T10:00:00Z",
+            "end": "2026-03-02T12:50:00Z",
+            "movie": movie.pk,
+            "movie_title": "Heat",
+            "movie_duration": 170,
+            "hall": hall.pk,
+            "hall_name": "Red",
+            "seats_total": 5,
+            "seats_sold": 2,
+            "seats_free": 3,
+        }
+    ]
+
+
+@pytest.mark.django_db
+def test_schedule_filters(api_client, hall):
+    genre = GenreFactory()
+    other_hall = CinemaHallFactory()
+    wanted = MovieScreeningFactory(
+        hall=hall, date=START + timedelta(days=1), movie__genres=[genre]
+    )
+    MovieScreeningFactory(hall=hall, date=START + timedelta(days=2))
+    MovieScreeningFactory(
+        hall=other_hall, date=START + timedelta(days=1), movie__genres=[genre]
+    )
+    MovieScreeningFactory(
+        hall=hall, date=START + timedelta(days=8), movie__genres=[genre]
+    )
+
+    response = get_schedule(api_client, hall=hall.pk, genre=genre.pk)
+
+    assert [screening["id"] for screening in response.data["results"]] == [wanted.pk]
+
+
+@pytest.mark.django_db
+def test_schedule_rejects_inverted_or_long_ranges(api_client):
+    inverted = get_schedule(api_client, to=(START - timedelta(days=1)).isoformat())
+    too_long = get_schedule(api_client, to=(START + timedelta(days=60)).isoformat())
+
+    assert inverted.status_code == 400
+    assert too_long.status_code == 400
+
+
+@pytest.mark.django_db
+def test_schedule_etag_follows_movies_and_halls(api_client, hall):
+    screening = MovieScreeningFactory(hall=hall, date=START)
+    url = reverse("schedule")
+    params = {"from": START.isoformat()}
+    etag = api_client.get(url, params)["ETag"]
+
+    unchanged = api_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    screening.movie.save()
+    retitled = api_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    hall.save()
+    renamed = api_client.get(url, params, HTTP_IF_NONE_MATCH=retitled["ETag"])
+
+    assert unchanged.status_code == 304
+    assert retitled.status_code == 200
+    assert renamed.status_code == 200
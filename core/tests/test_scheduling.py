@@ -0,0 +1,199 @@
+import json
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest.mock import ANY
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.urls import reverse
+
+from core.models import MovieScreening
+from core.scheduling import overlapping, upsert_chunk
+from core.tests.factories import (
+    CinemaHallFactory,
+    MovieFactory,
+    MovieScreeningFactory,
+)
+
+START = datetime(2026, 3, 2, 10, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def booked():
+    return MovieScreeningFactory(movie__duration=120, date=START)
+
+
+def post_screening(api_client, movie, hall, date):
+    return api_client.post(
+        reverse("screening-list"),
+        {"movie": movie.pk, "hall": hall.pk, "date": date.isoformat()},
+    )
+
+
+@pytest.mark.django_db
+def test_overlapping_screenings_are_rejected(api_client, booked):
+    movie = MovieFactory(duration=60)
+
+    overlap = post_screening(
+        api_client, movie, booked.hall, START - timedelta(hours=0.5)
+    )
+    after = post_screening(api_client, movie, booked.hall, START + timedelta(hours=2))
+    elsewhere = post_screening(api_client, movie, CinemaHallFactory(), START)
+
+    assert overlap.status_code == 400
+    assert f"screening {booked.pk}" in overlap.data["date"][0]
+    assert after.status_code == 201
+    assert elsewhere.status_code == 201
+
+
+@pytest.mark.django_db
+def test_moving_a_screening_checks_other_screenings_only(api_client, booked):
+    later = MovieScreeningFactory(
+        hall=booked.hall, movie__duration=60, date=START + timedelta(hours=3)
+    )
+    url = reverse("screening-detail", kwargs={"pk": later.pk})
+
+    assert api_client.patch(url, {"date": START.isoformat()}).status_code == 400
+    moved = api_client.patch(url, {"date": (START + timedelta(hours=2)).isoformat()})
+    assert moved.status_code == 200
+    later.refresh_from_db()
+    assert later.period.upper == START + timedelta(hours=3)
+
+
+@pytest.mark.django_db
+def test_database_refuses_overlaps(booked):
+    with pytest.raises(IntegrityError):
+        MovieScreeningFactory(hall=booked.hall, date=START + timedelta(minutes=90))
+
+
+@pytest.mark.django_db
+def test_overlap_check_uses_the_exclusion_index(booked):
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+
+    plan = overlapping(booked.hall_id, booked.period).explain()
+
+    # On a near-empty table the planner may as well probe the (hall, date)
+    # unique index by hall; either way the check never scans the table.
+    assert "Seq Scan" not in plan
+    assert (
+        "exclude_overlapping_screenings" in plan
+        or "unique_screening_per_hall_date" in plan
+    )
+
+
+@pytest.mark.django_db
+def test_longer_movie_must_still_fit(api_client, booked):
+    MovieScreeningFactory(hall=booked.hall, date=START + timedelta(hours=2.5))
+    url = reverse("movie-detail", kwargs={"pk": booked.movie_id})
+
+    fits = api_client.patch(url, {"duration": 150})
+    too_long = api_client.patch(url, {"duration": 180})
+
+    assert fits.status_code == 200
+    assert too_long.status_code == 409
+    booked.refresh_from_db()
+    assert booked.period.upper == START + timedelta(minutes=150)
+
+
+@pytest.fixture
+def week():
+    movie = MovieFactory(duration=100)
+    hall = CinemaHallFactory()
+    return [
+        {"movie": movie.pk, "hall": hall.pk, "date": START + timedelta(days=day)}
+        for day in range(7)
+    ]
+
+
+@pytest.mark.django_db
+def test_schedule_import_reports_bad_rows_and_imports_the_rest(
+    api_client, booked, week, django_assert_max_num_queries
+):
+    movie, hall = week[0]["movie"], week[0]["hall"]
+    rows = week + [
+        {"movie": movie, "hall": hall, "date": START + timedelta(minutes=90)},
+        {"movie": movie, "hall": booked.hall_id, "date": START + timedelta(hours=1)},
+        {"movie": 0, "hall": hall, "date": START - timedelta(days=1)},
+        {"movie": movie, "hall": hall, "date": "tomorrow"},
+    ]
+
+    with django_assert_max_num_queries(6):
+        response = api_client.post(
+            reverse("screening-import"), {"screenings": rows}, format="json"
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "imported": 7,
+        "errors": {
+            "7": {"date": [f"Overlaps row 0 of this schedule in hall {hall}."]},
+            "8": {
+                "date": [
+                    f"Hall {booked.hall_id} is booked by screening {booked.pk} "
+                    "until 2026-03-02 12:00."
+                ]
+            },
+            "9": {"movie": ["Does not exist."]},
+            "10": {"date": [ANY]},
+        },
+    }
+    assert MovieScreening.objects.filter(hall=hall).count() == 7
+
+
+@pytest.mark.django_db
+def test_schedule_import_upserts_by_hall_and_date(api_client, booked):
+    longer = MovieFactory(duration=150)
+    after = MovieScreeningFactory(
+        hall=booked.hall, movie__duration=60, date=START + timedelta(hours=2)
+    )
+    body = f"movie,hall,date\n{longer.pk},{booked.hall_id},{START.isoformat()}\n"
+    url = reverse("screening-import")
+
+    clash = api_client.post(url, body, content_type="text/csv")
+    after.delete()
+    replaced = api_client.post(url, body, content_type="text/csv")
+
+    assert clash.status_code == 400
+    assert replaced.json() == {"imported": 1, "errors": {}}
+    booked.refresh_from_db()
+    assert booked.movie == longer
+    assert booked.period.upper == START + timedelta(minutes=150)
+    assert MovieScreening.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_rows_that_conflict_after_the_check_are_retried_one_by_one(booked, week):
+    screenings = {
+        row: MovieScreening(
+            movie_id=item["movie"],
+            hall_id=item["hall"],
+            date=item["date"],
+            period=MovieScreening.period_of(item["date"], 100),
+        )
+        for row, item in enumerate(week[:3])
+    }
+    screenings[1].hall_id = booked.hall_id
+    screenings[1].date = START + timedelta(hours=1)
+    screenings[1].period = MovieScreening.period_of(screenings[1].date, 100)
+    errors = {}
+
+    imported = upsert_chunk(list(screenings.items()), errors)
+
+    assert imported == 2
+    assert list(errors) == [1]
+
+
+@pytest.mark.django_db
+def test_import_schedule_command(tmp_path, week):
+    path = tmp_path / "week.json"
+    path.write_text(json.dumps(week[:3] + [{"movie": "x"}], default=str))
+    stdout, stderr = StringIO(), StringIO()
+
+    call_command("import_schedule", str(path), stdout=stdout, stderr=stderr)
+
+    assert stdout.getvalue() == "Imported 3 screenings, rejected 1\n"
+    assert stderr.getvalue().startswith("Row 3: ")
+    with pytest.raises(CommandError):
+        call_command("import_schedule", str(tmp_path / "week.txt"))
@@ -0,0 +1,66 @@
+import pytest
+from django.urls import reverse
+
+from core.tests.factories import (
+    CinemaHallFactory,
+    MovieScreeningFactory,
+    SeatFactory,
+    TicketFactory,
+)
+
+
+@pytest.mark.django_db
+def test_seat_map_is_row_major_with_gaps(api_client, django_assert_num_queries):
+    hall = CinemaHallFactory()
+    screening = MovieScreeningFactory(hall=hall)
+    seats = {
+        (row, number): SeatFactory(hall=hall, row=row, number=number)
+        for row, number in [(1, 1), (1, 2), (1, 3), (2, 1), (2, 3), (4, 2)]
+    }
+    TicketFactory(movie_screening=screening, seat=seats[(1, 2)])
+    TicketFactory(movie_screening=screening, seat=seats[(2, 3)])
+    TicketFactory(seat=seats[(1, 1)])
+
+    with django_assert_num_queries(2):
+        response = api_client.get(
+            reverse("screening-seat-map", kwargs={"pk": screening.pk})
+        )
+
+    assert response.status_code == 200
+    assert response.data["rows"] == [1, 2, 4]
+    assert response.data["width"] == 3
+    assert response.data["seats"] == "010" "0-1" "-0-"
+    assert response.data["ids"] == [seat.pk for _, seat in sorted(seats.items())]
+
+
+@pytest.mark.django_db
+def test_seat_map_of_empty_hall(api_client):
+    screening = MovieScreeningFactory()
+
+    response = api_client.get(
+        reverse("screening-seat-map", kwargs={"pk": screening.pk})
+    )
+
+    assert response.status_code == 200
+    assert response.data["seats"] == ""
+    assert response.data["rows"] == []
+
+
+@pytest.mark.django_db
+def test_seat_map_of_missing_screening(api_client):
+    response = api_client.get(reverse("screening-seat-map", kwargs={"pk": 1}))
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_seats_outside_the_map_grid_are_rejected(api_client):
+    seat = SeatFactory(row=1, number=1)
+    url = reverse("seat-list")
+
+    zero = api_client.post(url, {"row": 1, "number": 0, "hall": seat.hall_id})
+    repeated = api_client.post(url, {"row": 1, "number": 1, "hall": seat.hall_id})
+
+    assert zero.status_code == 400
+    assert "number" in zero.data
+    assert repeated.status_code == 400
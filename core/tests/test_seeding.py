@@ -0,0 +1,52 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F
+
+from core.models import CinemaHall, Movie, MovieScreening, Seat, Ticket
+from core.tests.factories import CinemaHallFactory, bulk_create_batch
+
+TINY = [
+    "--genres=3",
+    "--actors=10",
+    "--movies=4",
+    "--halls=2",
+    "--rows=3",
+    "--seats-per-row=5",
+    "--screenings=6",
+    "--occupancy=0.5",
+]
+
+
+@pytest.mark.django_db
+def test_seed_cinema_creates_the_requested_dataset():
+    call_command("seed_cinema", *TINY)
+
+    assert Movie.objects.count() == 4
+    assert Movie.genres.through.objects.count() == 8
+    assert CinemaHall.objects.count() == 2
+    assert Seat.objects.count() == 30
+    assert MovieScreening.objects.count() == 6
+    assert Ticket.objects.count() == 6 * 7
+    assert not Ticket.objects.filter(updated_at__isnull=True).exists()
+    assert not Ticket.objects.exclude(seat__hall=F("movie_screening__hall")).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_seed_cinema_refuses_to_seed_twice_without_flush():
+    call_command("seed_cinema", *TINY)
+
+    with pytest.raises(CommandError):
+        call_command("seed_cinema", *TINY)
+
+    call_command("seed_cinema", *TINY, "--flush")
+    assert MovieScreening.objects.count() == 6
+
+
+@pytest.mark.django_db
+def test_bulk_create_batch_inserts_in_batches(django_assert_num_queries):
+    with django_assert_num_queries(3):
+        halls = bulk_create_batch(CinemaHallFactory, 25, batch_size=10)
+
+    assert len(halls) == 25
+    assert all(hall.pk for hall in halls)
+    assert CinemaHall.objects.aggregate(count=Count("id"))["count"] == 25
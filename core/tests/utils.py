@@ -0,0 +1,16 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+
+def assert_constant_queries(client, url, create_rows, sizes=(1, 10)):
+    counts = {}
+    for size in sizes:
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            create_rows(size)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == 200
+        counts[size] = len(queries)
+    assert len(set(counts.values())) == 1, f"Query count grows with rows: {counts}"
+    return counts[sizes[0]]
@@ -0,0 +1,19 @@
+from functools import lru_cache
+from itertools import islice
+
+from django.utils.module_loading import import_string
+
+
+@lru_cache
+def _load(path, options):
+    return import_string(path)(**dict(options))
+
+
+def load_backend(config, key="BACKEND"):
+    return _load(config[key], tuple(sorted(config.get("OPTIONS", {}).items())))
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
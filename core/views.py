@@ -1,72 +1,388 @@
-from rest_framework import generics, viewsets
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from rest_framework import generics, status, viewsets
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from core.booking import release_hold
+from core.cache import CachedResponseMixin, cache_stats
+from core.conditional import ConditionalGetMixin
+from core.counters import recount_halls
+from core.events import seat_event_stream
+from core.exports import EXPORTS, FORMATS, pull_async
+from core.filters import (
+    ActorFilter,
+    MovieFilter,
+    MovieScreeningFilter,
+    TicketFilter,
+)
+from core.instrumentation import request_stats
+from core.metrics import render_metrics
 from core.models import Actor, CinemaHall, Genre, Movie, MovieScreening, Seat, Ticket
+from core.pagination import decode_keyset, encode_keyset, get_page_size
+from core.parsers import CSVParser
+from core.reports import occupancy, revenue
+from core.schedule import schedule
+from core.seat_map import abuild_seat_map, build_seat_map
 from core.serializers import (
     ActorSerializer,
     CinemaHallSerializer,
     GenreSerializer,
+    HallLayoutSerializer,
     MovieScreeningSerializer,
     MovieSerializer,
+    OccupancySerializer,
+    ReportQuerySerializer,
+    RevenueQuerySerializer,
+    ScheduleImportSerializer,
+    ScheduleQuerySerializer,
+    ScheduleSerializer,
+    SeatHoldSerializer,
+    SeatMapSerializer,
     SeatSerializer,
+    TicketBatchSerializer,
     TicketSerializer,
 )
 
 
-class GenreViewSet(viewsets.ModelViewSet):
+class GenreViewSet(CachedResponseMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_models = (Genre,)
 
 
-class ActorViewSet(viewsets.ModelViewSet):
+class ActorViewSet(CachedResponseMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
+    filterset_class = ActorFilter
+    cache_models = (Actor,)
 
 
-class MovieCreateView(generics.ListCreateAPIView):
-    queryset = Movie.objects.all()
-    serializer_class = MovieSerializer
+MOVIE_RELATED_MODELS = {"genres": Genre, "actors": Actor}
+
+
+def parse_expand(request):
+    if request is None or request.method not in SAFE_METHODS:
+        return set()
+    requested = request.GET.get("expand", "").split(",")
+    return set(requested) & set(MovieSerializer.expandable_fields)
 
 
-class MovieDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Movie.objects.all()
+def movie_queryset(expand):
+    return Movie.objects.only("id", "title", "duration", "updated_at").prefetch_related(
+        *(
+            Prefetch(
+                name,
+                queryset=(
+                    model.objects.all() if name in expand else model.objects.only("id")
+                ),
+            )
+            for name, model in MOVIE_RELATED_MODELS.items()
+        )
+    )
+
+
+class MovieQuerysetMixin:
     serializer_class = MovieSerializer
+    related_models = MOVIE_RELATED_MODELS
+
+    def get_expand(self):
+        return parse_expand(self.request)
+
+    def get_queryset(self):
+        return movie_queryset(self.get_expand())
 
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "expand": self.get_expand()}
 
-class CinemaHallCreateView(generics.ListCreateAPIView):
+    def get_validator_querysets(self):
+        return [
+            self.filter_queryset(self.get_queryset()),
+            *(
+                self.related_models[name].objects.all()
+                for name in sorted(self.get_expand())
+            ),
+        ]
+
+
+class MovieCreateView(
+    MovieQuerysetMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    generics.ListCreateAPIView,
+):
+    filterset_class = MovieFilter
+    cache_models = (Movie, Genre, Actor)
+
+
+class MovieDetailView(
+    MovieQuerysetMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
+    cache_models = (Movie, Genre, Actor)
+
+
+class CinemaHallCreateView(
+    CachedResponseMixin, ConditionalGetMixin, generics.ListCreateAPIView
+):
     queryset = CinemaHall.objects.all()
     serializer_class = CinemaHallSerializer
+    cache_models = (CinemaHall,)
 
 
-class CinemaHallDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CinemaHallDetailView(
+    CachedResponseMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView
+):
     queryset = CinemaHall.objects.all()
     serializer_class = CinemaHallSerializer
+    cache_models = (CinemaHall,)
 
 
-class SeatCreateView(generics.ListCreateAPIView):
+class CinemaHallLayoutView(generics.CreateAPIView):
+    queryset = CinemaHall.objects.all()
+    serializer_class = HallLayoutSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(hall=self.get_object())
+
+
+class SeatCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Seat.objects.all()
     serializer_class = SeatSerializer
 
+    @transaction.atomic
+    def perform_create(self, serializer):
+        recount_halls([serializer.save().hall_id])
 
-class SeatDetailView(generics.RetrieveUpdateDestroyAPIView):
+
+class SeatDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Seat.objects.all()
     serializer_class = SeatSerializer
 
+    # Seats change hall totals, and deleting one unseats its tickets.
+    @transaction.atomic
+    def perform_update(self, serializer):
+        previous_hall_id = serializer.instance.hall_id
+        recount_halls({previous_hall_id, serializer.save().hall_id})
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        recount_halls([instance.hall_id])
 
-class MovieScreeningCreateView(generics.ListCreateAPIView):
+
+class MovieScreeningCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = MovieScreening.objects.all()
     serializer_class = MovieScreeningSerializer
+    filterset_class = MovieScreeningFilter
+    ordering = ("date", "id")
+
+
+class ScheduleImportView(generics.CreateAPIView):
+    serializer_class = ScheduleImportSerializer
+    parser_classes = [JSONParser, CSVParser]
+
+    def create(self, request, *args, **kwargs):
+        # Takes {"screenings": [...]}, a bare JSON list or CSV with a
+        # movie,hall,date header. Rows are upserted by hall and date.
+        data = request.data
+        if isinstance(data, list):
+            data = {"screenings": data}
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+        if result["errors"] and not result["imported"]:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
 
 
-class MovieScreeningDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MovieScreeningDetailView(
+    ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView
+):
     queryset = MovieScreening.objects.all()
     serializer_class = MovieScreeningSerializer
 
 
-class TicketCreateView(generics.ListCreateAPIView):
+class ScreeningSeatMapView(generics.RetrieveAPIView):
+    queryset = MovieScreening.objects.only("id", "hall_id", "date")
+    serializer_class = SeatMapSerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(build_seat_map(self.get_object()))
+        return Response(serializer.data)
+
+
+async def screening_events(request, pk):
+    # A WSGI worker would buffer the endless stream and hold its thread forever.
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Seat events need the ASGI server."},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    if not await MovieScreening.objects.filter(pk=pk).aexists():
+        raise Http404
+    response = StreamingHttpResponse(
+        seat_event_stream(pk), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def async_movie_detail(request, pk):
+    expand = parse_expand(request)
+    try:
+        movie = await movie_queryset(expand).aget(pk=pk)
+    except Movie.DoesNotExist:
+        raise Http404
+    return JsonResponse(MovieSerializer(movie, context={"expand": expand}).data)
+
+
+async def async_seat_map(request, pk):
+    try:
+        screening = await MovieScreening.objects.only("id", "hall_id", "date").aget(
+            pk=pk
+        )
+    except MovieScreening.DoesNotExist:
+        raise Http404
+    return JsonResponse(await abuild_seat_map(screening))
+
+
+async def async_schedule(request):
+    query = ScheduleQuerySerializer(data=request.GET)
+    if not query.is_valid():
+        return JsonResponse(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    page_size = get_page_size(request)
+    screenings = schedule(**query.validated_data).order_by("date", "id")
+    if "cursor" in request.GET:
+        date, pk = decode_keyset(request.GET["cursor"])
+        screenings = screenings.filter(Q(date__gt=date) | Q(date=date, pk__gt=pk))
+
+    page = [screening async for screening in screenings[: page_size + 1]]
+    next_url = None
+    if len(page) > page_size:
+        page = page[:page_size]
+        params = request.GET.copy()
+        params["cursor"] = encode_keyset(page[-1].date, page[-1].pk)
+        next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+    return JsonResponse(
+        {"next": next_url, "results": ScheduleSerializer(page, many=True).data}
+    )
+
+
+class ScreeningHoldView(generics.CreateAPIView):
+    queryset = MovieScreening.objects.only("id", "hall_id")
+    serializer_class = SeatHoldSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(movie_screening=self.get_object())
+
+
+class ScreeningHoldReleaseView(generics.DestroyAPIView):
+    queryset = MovieScreening.objects.only("id")
+    serializer_class = SeatHoldSerializer
+
+    def destroy(self, request, *args, **kwargs):
+        release_hold(self.get_object(), kwargs["token"])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ScheduleView(ConditionalGetMixin, generics.ListAPIView):
+    serializer_class = ScheduleSerializer
+    ordering = ("date", "id")
+    validator_fields = ("updated_at", "movie__updated_at", "hall__updated_at")
+
+    def get_queryset(self):
+        query = ScheduleQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        return schedule(**query.validated_data)
+
+
+class RevenueReportView(APIView):
+    def get(self, request):
+        query = RevenueQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        rows = list(revenue(**query.validated_data))
+        return Response(
+            {
+                "from": query.validated_data["date_from"],
+                "to": query.validated_data["date_to"],
+                "tickets": sum(row["tickets"] for row in rows),
+                "revenue": sum(row["revenue"] for row in rows),
+                "results": rows,
+            }
+        )
+
+
+class OccupancyReportView(generics.ListAPIView):
+    serializer_class = OccupancySerializer
+    ordering = ("date", "id")
+
+    def get_queryset(self):
+        query = ReportQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        return occupancy(**query.validated_data)
+
+
+def export(request, name, fmt):
+    if name not in EXPORTS or fmt not in FORMATS:
+        raise Http404
+    query = ReportQuerySerializer(data=request.GET)
+    if not query.is_valid():
+        return JsonResponse(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    columns, rows = EXPORTS[name](**query.validated_data)
+    stream, content_type = FORMATS[fmt]
+    content = stream(columns, rows)
+    if isinstance(request, ASGIRequest):
+        content = pull_async(content)
+    response = StreamingHttpResponse(content, content_type=content_type)
+    dates = [query.validated_data[key].date() for key in ("date_from", "date_to")]
+    response["Content-Disposition"] = (
+        f'attachment; filename="{name}-{dates[0]}-{dates[1]}.{fmt}"'
+    )
+    return response
+
+
+class CacheStatsView(APIView):
+    def get(self, request):
+        return Response(cache_stats())
+
+
+def metrics(request):
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+class RequestStatsView(APIView):
+    def get(self, request):
+        return Response(request_stats())
+
+
+class TicketCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
+    filterset_class = TicketFilter
+
+
+class TicketBatchCreateView(generics.CreateAPIView):
+    serializer_class = TicketBatchSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        tickets = serializer.save()
+        return Response(
+            TicketSerializer(tickets, many=True).data, status=status.HTTP_201_CREATED
+        )
 
 
-class TicketDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TicketDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
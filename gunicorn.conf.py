@@ -0,0 +1,36 @@
+import multiprocessing
+import os
+
+# SERVER_MODE=asgi runs uvicorn workers for the async views and the seat event
+# stream, with pooled database connections; SERVER_MODE=wsgi runs threaded sync
+# workers, which cannot serve the event stream. The settings read it too.
+SERVER_MODE = os.environ.get("SERVER_MODE", "asgi")
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8080")
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+
+if SERVER_MODE == "asgi":
+    wsgi_app = "tickets.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "tickets.wsgi:application"
+    worker_class = "gthread"
+    threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+# Recycle workers now and then to cap slow memory growth.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 5000))
+max_requests_jitter = max_requests // 10
+accesslog = "-"
+
+
+def on_starting(server):
+    # Metric files from a previous run would otherwise be summed in again.
+    directory = os.environ.get("METRICS_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.startswith("metrics-"):
+                os.remove(os.path.join(directory, name))
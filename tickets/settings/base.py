@@ -24,12 +24,16 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 THIRD_PARTY_APPS = ["rest_framework", "django_filters", "drf_spectacular"]
 LOCAL_APPS = ["core"]
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "core.metrics.MetricsMiddleware",
+    "core.instrumentation.RequestMetricsMiddleware",
+    "core.routing.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -41,8 +45,79 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.CursorPagination",
+    "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    "PAGE_SIZE": 50,
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+RESPONSE_CACHE = {
+    "CACHE": "default",
+    "TIMEOUT": 300,
+}
+
+PRICING = {
+    "RULES": "core.pricing.PriceRules",
+    "OPTIONS": {
+        "base": 30,
+        # (from hour, factor), in TIME_ZONE
+        "time_slots": ((0, 0.8), (12, 1.0), (17, 1.2), (22, 1.0)),
+        # Monday first
+        "weekdays": (1.0, 1.0, 1.0, 1.0, 1.1, 1.2, 1.2),
+        # (up to this share of rows from the screen, factor)
+        "zones": ((0.25, 0.8), (0.75, 1.0), (1.0, 1.1)),
+        # (up to this share of seats sold, factor)
+        "occupancy": ((0.5, 1.0), (0.8, 1.1), (1.0, 1.25)),
+    },
+}
+
+SEAT_HOLDS = {
+    "BACKEND": "core.holds.DatabaseHoldBackend",
+    "TTL": 600,
+}
+
+SEAT_EVENTS = {
+    "BROKER": "core.events.InProcessBroker",
+    "KEEPALIVE": 15,
+    "RETRY_MS": 3000,
+}
+
+# SAMPLE_RATE is the share of requests that get query/timing metrics and a
+# Server-Timing header; 0 turns the instrumentation off.
+REQUEST_METRICS = {
+    "SAMPLE_RATE": float(os.environ.get("REQUEST_METRICS_SAMPLE_RATE", 0)),
+    "SERVER_TIMING": True,
+    "SLOW_QUERY_MS": 200,
+    "DUPLICATE_QUERIES": 5,
+}
+
+# With DIRECTORY set, every worker process writes its metrics to files there
+# and /metrics reports the sum; it must be emptied when the server starts.
+METRICS = {
+    "DIRECTORY": os.environ.get("METRICS_DIR"),
+}
+
+# SUMMARY=True serves revenue reports from the ScreeningSales table, which
+# must then be kept fresh with the refresh_sales_summary command.
+REPORTS = {
+    "SUMMARY": False,
+}
+
+# ALIASES name DATABASES entries of read replicas of "default". Safe requests
+# read from one of them; after a write the client stays on the primary for
+# PIN_SECONDS, which should cover the replicas' usual lag.
+DATABASE_REPLICAS = {
+    "ALIASES": [],
+    "PIN_SECONDS": 5,
+}
+
+DATABASE_ROUTERS = ["core.routing.ReplicaRouter"]
+
 ROOT_URLCONF = "tickets.urls"
 
 TEMPLATES = [
@@ -16,3 +16,8 @@ DATABASES = {
         "PORT": "5432",
     }
 }
+
+REQUEST_METRICS = {
+    **REQUEST_METRICS,
+    "SAMPLE_RATE": float(os.environ.get("REQUEST_METRICS_SAMPLE_RATE", 1)),
+}
@@ -8,7 +8,9 @@ SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY")
 
 DEBUG = False
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",") if host
+]
 
 DATABASES = {
     "default": {
@@ -21,7 +23,67 @@ DATABASES = {
     }
 }
 
+# Must match the SERVER_MODE gunicorn.conf.py runs under.
+SERVER_MODE = os.environ.get("SERVER_MODE", "asgi")
+
+# DB_CONNECTIONS=pool uses psycopg's connection pool, shared by the threads of
+# a worker; DB_CONNECTIONS=persistent keeps one health-checked connection per
+# thread. Keep workers * (pool max size or threads) below max_connections.
+# Under ASGI, Django's docs advise against persistent connections, so the
+# pool is the default there and persistent closes each request's connection.
+DB_CONNECTIONS = os.environ.get(
+    "DB_CONNECTIONS", "pool" if SERVER_MODE == "asgi" else "persistent"
+)
+
+if DB_CONNECTIONS == "pool":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 8)),
+            "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = (
+        0 if SERVER_MODE == "asgi" else int(os.environ.get("CONN_MAX_AGE", 60))
+    )
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# POSTGRES_REPLICA_HOSTS is a comma-separated list of streaming replicas of
+# the primary, reached with the same credentials and connection settings.
+for index, host in enumerate(
+    filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(","))
+):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_REPLICAS = {
+    **DATABASE_REPLICAS,
+    "ALIASES": [alias for alias in DATABASES if alias != "default"],
+}
+
+# Cached responses, seat holds and seat events must be shared by all workers.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+    SEAT_EVENTS = {
+        **SEAT_EVENTS,
+        "BROKER": "core.events.RedisBroker",
+        "OPTIONS": {"url": os.environ["REDIS_URL"]},
+    }
+
 sentry_sdk.init(
     dsn=os.environ.get("SENTRY_DSN"),
     send_default_pii=True,
 )
+
+REPORTS = {
+    **REPORTS,
+    "SUMMARY": os.environ.get("REPORTS_SUMMARY", "0") == "1",
+}
@@ -14,5 +14,20 @@ DATABASES = {
         "PASSWORD": "test_pass",
         "HOST": "db_test.",
         "PORT": "5432",
-    }
+    },
+    # A separate database rather than a mirror, so routing tests can tell
+    # which one served a read. Routing to it is enabled per test.
+    "replica": {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": "replica_db",
+        "USER": "postgres",
+        "PASSWORD": "test_pass",
+        "HOST": "db_test.",
+        "PORT": "5432",
+    },
+}
+
+SEAT_HOLDS = {
+    **SEAT_HOLDS,
+    "BACKEND": "core.holds.CacheHoldBackend",
 }
@@ -5,17 +5,34 @@ from rest_framework.routers import DefaultRouter
 
 from core.views import (
     ActorViewSet,
+    CacheStatsView,
     CinemaHallCreateView,
     CinemaHallDetailView,
+    CinemaHallLayoutView,
     GenreViewSet,
     MovieCreateView,
     MovieDetailView,
     MovieScreeningCreateView,
     MovieScreeningDetailView,
+    OccupancyReportView,
+    RequestStatsView,
+    RevenueReportView,
+    ScheduleImportView,
+    ScheduleView,
+    ScreeningHoldReleaseView,
+    ScreeningHoldView,
+    ScreeningSeatMapView,
     SeatCreateView,
     SeatDetailView,
+    TicketBatchCreateView,
     TicketCreateView,
     TicketDetailView,
+    async_movie_detail,
+    async_schedule,
+    async_seat_map,
+    export,
+    metrics,
+    screening_events,
 )
 from tickets.settings.local import DEBUG
 
@@ -27,6 +44,13 @@ router.register(r"actors", ActorViewSet, basename="actor")
 urlpatterns = [
     path("", include(router.urls)),
     path("admin/", admin.site.urls),
+    path("async/movies/<int:pk>/", async_movie_detail, name="async-movie-detail"),
+    path(
+        "async/screenings/<int:pk>/seats/",
+        async_seat_map,
+        name="async-screening-seat-map",
+    ),
+    path("async/schedule/", async_schedule, name="async-schedule"),
     path("movies/<int:pk>/", MovieDetailView.as_view(), name="movie-detail"),
     path("movies/", MovieCreateView.as_view(), name="movie-list"),
     path(
@@ -34,6 +58,11 @@ urlpatterns = [
         CinemaHallDetailView.as_view(),
         name="cinema-hall-detail",
     ),
+    path(
+        "cinema-halls/<int:pk>/layout/",
+        CinemaHallLayoutView.as_view(),
+        name="cinema-hall-layout",
+    ),
     path("cinema-halls/", CinemaHallCreateView.as_view(), name="cinema-hall-list"),
     path("seats/<int:pk>/", SeatDetailView.as_view(), name="seat-detail"),
     path("seats/", SeatCreateView.as_view(), name="seat-list"),
@@ -42,8 +71,37 @@ urlpatterns = [
         MovieScreeningDetailView.as_view(),
         name="screening-detail",
     ),
+    path(
+        "screenings/<int:pk>/seats/",
+        ScreeningSeatMapView.as_view(),
+        name="screening-seat-map",
+    ),
+    path(
+        "screenings/<int:pk>/events/",
+        screening_events,
+        name="screening-events",
+    ),
+    path(
+        "screenings/<int:pk>/holds/<str:token>/",
+        ScreeningHoldReleaseView.as_view(),
+        name="screening-hold-release",
+    ),
+    path(
+        "screenings/<int:pk>/holds/",
+        ScreeningHoldView.as_view(),
+        name="screening-hold",
+    ),
+    path("screenings/import/", ScheduleImportView.as_view(), name="screening-import"),
     path("screenings/", MovieScreeningCreateView.as_view(), name="screening-list"),
     path("tickets/<int:pk>/", TicketDetailView.as_view(), name="ticket-detail"),
+    path("cache-stats/", CacheStatsView.as_view(), name="cache-stats"),
+    path("exports/<str:name>.<str:fmt>", export, name="export"),
+    path("metrics", metrics, name="metrics"),
+    path("reports/occupancy/", OccupancyReportView.as_view(), name="report-occupancy"),
+    path("reports/revenue/", RevenueReportView.as_view(), name="report-revenue"),
+    path("request-stats/", RequestStatsView.as_view(), name="request-stats"),
+    path("schedule/", ScheduleView.as_view(), name="schedule"),
+    path("tickets/batch/", TicketBatchCreateView.as_view(), name="ticket-batch"),
     path("tickets/", TicketCreateView.as_view(), name="ticket-list"),
 ]
 